@@ -11,18 +11,38 @@ Main application entry point. Initializes Flask, database, and Socket.IO.
 Registers routes and blueprints, configures security, and launches the app.
 """
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
-from flask_socketio import SocketIO
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, abort, stream_with_context, g, current_app
+from flask_socketio import SocketIO, join_room
+from werkzeug.local import LocalProxy
 from werkzeug.security import check_password_hash
-from datetime import datetime
-from models import db, User, MenuItem, Table, Reservation, Order, OrderItem, Payment
+from datetime import datetime, date, timedelta
+import click
+from models import db, create_schema, upgrade_schema
+from repository import make_repository, DuplicateError, ConflictError, MissingFieldError
+from idempotency import IdempotencyStore, idempotent
+from search import MenuSearchIndex
+from floor import FloorState
+from forecast import run_forecast
+from seed import seed_defaults
+from locations import Location, LocationRegistry, parse_locations, merge_sales, requested_location, location_room
+from assets import StaticAssets, compress_response
+from query_budget import query_budget
 from config import Config
 
 # Create SocketIO once (no app yet), then bind inside factory
 socketio = SocketIO(cors_allowed_origins="*", async_mode="eventlet")
 
 
-def create_app(testing: bool = False):
+@socketio.on("connect")
+def join_location_room():
+    # each tablet only hears its own restaurant's events (see broadcast())
+    name = requested_location(current_app.config["DEFAULT_LOCATION"])
+    if name not in current_app.extensions["locations"]:
+        return False
+    join_room(location_room(name))
+
+
+def create_app(testing: bool = False, backend: str = None, locations: dict = None):
     app = Flask(__name__)
     app.config.from_object(Config)
 
@@ -31,49 +51,222 @@ def create_app(testing: bool = False):
         app.config["WTF_CSRF_ENABLED"] = False
         app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
         app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    if backend:
+        app.config["REPOSITORY_BACKEND"] = backend
+    if locations is None:
+        locations = parse_locations(app.config["LOCATIONS"])
+    # one bind (and pooled engine) per extra location; see LocationSession in models.py
+    app.config["SQLALCHEMY_BINDS"] = dict(locations)
 
     db.init_app(app)
+    # Locations share the models' tables, so the empty MetaData that init_app
+    # makes per bind is never used; without this db.create_all()/drop_all()
+    # would try to reach those binds (see create_schema() for the real thing)
+    for name in locations:
+        db.metadatas.pop(name, None)
     socketio.init_app(app)  # <-- bind socketio to this app
 
+    # Hashed, precompressed static files and compressed API bodies (see assets.py)
+    app.extensions["assets"] = StaticAssets(app, max_age=app.config["ASSET_MAX_AGE"])
+    app.after_request(compress_response)
+
+    # Storage backend and in-process indexes, one set per location
+    def new_location(name):
+        loc_repo = make_repository(app.config["REPOSITORY_BACKEND"])
+        store = IdempotencyStore(
+            loc_repo,
+            capacity=app.config["IDEMPOTENCY_CACHE_SIZE"],
+            ttl_seconds=app.config["IDEMPOTENCY_TTL_SECONDS"],
+        )
+        return Location(name, loc_repo, store, MenuSearchIndex(), FloorState())
+
+    default_location = app.config["DEFAULT_LOCATION"]
+    sites = LocationRegistry(
+        app,
+        default_location,
+        [new_location(name) for name in [default_location, *locations]],
+        max_workers=app.config["REPORT_WORKERS"],
+    )
+    app.extensions["locations"] = sites
+    # The names below always point at the current request's location
+    repo = LocalProxy(lambda: sites.current().repo)
+    menu_index = LocalProxy(lambda: sites.current().menu_search)
+    floor = LocalProxy(lambda: sites.current().floor)
+    app.extensions["repository"] = repo
+    app.extensions["idempotency"] = LocalProxy(lambda: sites.current().idempotency)
+    app.extensions["menu_search"] = menu_index
+    app.extensions["floor"] = floor
+
+    @app.before_request
+    def pick_location():
+        name = requested_location(default_location)
+        if name not in sites:
+            return jsonify({"error": "unknown_location", "locations": sites.names}), 404
+        g.location = name
+
     # --------- helpers ---------
+    def logged_in():
+        # user ids are per location database, so a login only counts where it happened
+        return session.get("user_id") and session.get("location", default_location) == g.location
+
     def require_login():
-        if not session.get("user_id"):
+        if not logged_in():
             return jsonify({"error": "login_required"}), 401
 
     def require_admin():
-        if not session.get("user_id"):
+        if not logged_in():
             return jsonify({"error": "login_required"}), 401
-        u = User.query.get(session["user_id"])
-        if not u or getattr(u, "role", "") != "admin":
+        u = repo.get_user(session["user_id"])
+        if not u or u.get("role", "") != "admin":
             return jsonify({"error": "admin_only"}), 403
 
+    def broadcast(event):
+        # Every write event feeds the live floor model, then goes out to clients
+        floor.apply(event)
+        socketio.emit("event", {**event, "location": g.location}, to=location_room(g.location))
+
+    def found(obj):
+        if not obj:
+            abort(404)
+        return obj
+
+    def day_arg(name="date"):
+        value = request.args.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            abort(400)
+
+    def if_match_version():
+        # Versions travel as ETags: If-Match: "3" (W/"3" and bare 3 also accepted)
+        raw = (request.headers.get("If-Match") or "").strip()
+        if not raw or raw == "*":
+            return None
+        try:
+            return int(raw.removeprefix("W/").strip('"'))
+        except ValueError:
+            abort(400)
+
+    def number(value, kind=float):
+        # int()/float() of null or text in a JSON body is the client's mistake, not a 500
+        try:
+            return kind(value)
+        except (TypeError, ValueError):
+            abort(400)
+
+    def with_etag(payload, version, status=200):
+        resp = jsonify(payload)
+        resp.status_code = status
+        resp.set_etag(str(version))
+        return resp
+
+    def wants_stream():
+        return request.args.get("stream", "").lower() in ("1", "true", "yes")
+
+    def json_array_stream(rows, chunk_bytes=64 * 1024):
+        # Writes a JSON array row by row; only one chunk is ever buffered.
+        def generate():
+            yield "["
+            buf, size, sep = [], 0, ""
+            for row in rows:
+                part = sep + app.json.dumps(row)
+                sep = ","
+                buf.append(part)
+                size += len(part)
+                if size >= chunk_bytes:
+                    yield "".join(buf)
+                    buf, size = [], 0
+            buf.append("]")
+            yield "".join(buf)
+
+        return app.response_class(stream_with_context(generate()), mimetype="application/json")
+
+    def id_ref(value, kinds=int):
+        # ids are used as dict keys and SQL parameters; None passes through
+        if value is not None and (isinstance(value, bool) or not isinstance(value, kinds)):
+            raise ValueError(f"invalid reference {value!r}")
+        return value
+
+    def parse_items(raw):
+        items = []
+        for it in raw:
+            if "menu_item_id" in it:
+                items.append({"menu_item_id": id_ref(it["menu_item_id"]), "quantity": int(it.get("quantity", 1))})
+            else:
+                items.append({
+                    "name": it.get("name", "Custom"),
+                    "price": float(it.get("price", 0)),
+                    "quantity": int(it.get("quantity", 1)),
+                })
+        return items
+
+    def parse_sync_op(op):
+        # "order" is the client_id of an earlier create_order in the batch, else a server id (int)
+        kind = op.get("op") if isinstance(op, dict) else None
+        try:
+            if kind == "create_order":
+                return {"op": kind, "client_id": id_ref(op.get("client_id"), (int, str)),
+                        "table_id": id_ref(op.get("table_id")), "items": parse_items(op.get("items", []))}
+            if kind == "add_items":
+                return {"op": kind, "order": id_ref(op.get("order"), (int, str)),
+                        "items": parse_items(op.get("items", []))}
+            if kind == "pay":
+                return {"op": kind, "client_id": id_ref(op.get("client_id"), (int, str)),
+                        "order": id_ref(op.get("order"), (int, str)),
+                        "amount": float(op["amount"]) if "amount" in op else None,
+                        "method": op.get("method", "cash")}
+        except (TypeError, ValueError, AttributeError):
+            return {"op": kind, "error": "invalid"}
+        return {"op": kind, "error": "unknown_op"}
+
+    @app.errorhandler(DuplicateError)
+    def duplicate(e):
+        return jsonify({"error": "duplicate", "detail": str(e)}), 409
+
+    @app.errorhandler(MissingFieldError)
+    def missing_field(e):
+        return jsonify({"error": "missing_field", "detail": str(e)}), 400
+
+    @app.errorhandler(ConflictError)
+    def conflict(e):
+        if e.current is None:
+            return jsonify({"error": "conflict"}), 409
+        return with_etag({"error": "conflict", "current": e.current}, e.current["version"], 409)
+
     # --------- core routes ---------
     @app.get("/")
+    @query_budget(0)
     def index():
         if session.get("user_id"):
             return redirect(url_for("dashboard"))
         return redirect(url_for("login"))
 
     @app.route("/login", methods=["GET", "POST"])
+    @query_budget(1)
     def login():
         if request.method == "GET":
             return render_template("login.html")
         data = request.form if request.form else (request.get_json(silent=True) or {})
         username = (data.get("username") or "").strip()
         password = data.get("password") or ""
-        user = User.query.filter_by(username=username).first()
-        if user and check_password_hash(user.password_hash, password):
-            session["user_id"] = user.id
-            session["username"] = user.username
+        user = repo.get_user_by_username(username)
+        if user and check_password_hash(user["password_hash"], password):
+            session["user_id"] = user["id"]
+            session["username"] = user["username"]
+            session["location"] = g.location
             return jsonify({"ok": True, "redirect": url_for("dashboard")})
         return jsonify({"ok": False, "error": "Invalid credentials"}), 401
 
     @app.post("/logout")
+    @query_budget(0)
     def logout():
         session.clear()
         return jsonify({"ok": True})
 
     @app.get("/dashboard")
+    @query_budget(0)
     def dashboard():
         if not session.get("user_id"):
             return redirect(url_for("login"))
@@ -81,244 +274,314 @@ def create_app(testing: bool = False):
 
     # ---------- MENU ----------
     @app.get("/api/menu")
+    @query_budget(1)
     def list_menu():
-        items = MenuItem.query.order_by(MenuItem.id.desc()).all()
-        return jsonify([m.to_dict() for m in items])
+        return jsonify(repo.list_menu())
+
+    @app.get("/api/menu/search")
+    @query_budget(1)
+    def search_menu():
+        if not menu_index.loaded:
+            menu_index.rebuild(repo.list_menu())
+        available = request.args.get("available")
+        if available is not None:
+            available = available.lower() in ("1", "true", "yes")
+        limit = max(1, min(request.args.get("limit", 20, type=int), 100))
+        return jsonify(menu_index.search(request.args.get("q", ""), available=available, limit=limit))
 
     @app.post("/api/menu")
+    @query_budget(2)
     def create_menu():
         resp = require_login()
         if resp:
             return resp
         data = request.get_json(silent=True) or {}
-        m = MenuItem(
+        m = repo.create_menu(
             name=data.get("name", "Item"),
-            price=float(data.get("price", 0)),
+            price=number(data.get("price", 0)),
             category=data.get("category", "General"),
             available=bool(data.get("available", True)),
         )
-        db.session.add(m)
-        db.session.commit()
-        socketio.emit("event", {"type": "menu.created", "item": m.to_dict()})
-        return jsonify(m.to_dict()), 201
+        menu_index.add(m)
+        broadcast({"type": "menu.created", "item": m})
+        return jsonify(m), 201
 
     # ---------- TABLES ----------
     @app.get("/api/tables")
+    @query_budget(1)
     def list_tables():
-        tables = Table.query.order_by(Table.id.desc()).all()
-        return jsonify([t.to_dict() for t in tables])
+        return jsonify(repo.list_tables())
 
     @app.post("/api/tables")
+    @query_budget(2)
     def create_table():
         resp = require_login()
         if resp:
             return resp
         data = request.get_json(silent=True) or {}
-        t = Table(label=data.get("label", "T?"), capacity=int(data.get("capacity", 2)))
-        db.session.add(t)
-        db.session.commit()
-        socketio.emit("event", {"type": "table.created", "table": t.to_dict()})
-        return jsonify(t.to_dict()), 201
+        t = repo.create_table(label=data.get("label", "T?"), capacity=number(data.get("capacity", 2), int))
+        broadcast({"type": "table.created", "table": t})
+        return jsonify(t), 201
 
     # ---------- RESERVATIONS ----------
     @app.get("/api/reservations")
+    @query_budget(1)
     def list_reservations():
-        res = Reservation.query.order_by(Reservation.id.desc()).all()
-        return jsonify([r.to_dict() for r in res])
+        return jsonify(repo.list_reservations(table_id=request.args.get("table_id", type=int), day=day_arg()))
 
     @app.post("/api/reservations")
+    @query_budget(2)
     def create_reservation():
         resp = require_login()
         if resp:
             return resp
         data = request.get_json(silent=True) or {}
-        r = Reservation(
+        r = repo.create_reservation(
             name=data.get("name", "Guest"),
             phone=data.get("phone", "+1"),
-            size=int(data.get("size", 2)),
+            size=number(data.get("size", 2), int),
             time=datetime.fromisoformat(data["time"]) if data.get("time") else datetime.utcnow(),
             table_id=data.get("table_id"),
         )
-        db.session.add(r)
-        db.session.commit()
-        socketio.emit("event", {"type": "reservation.created", "reservation": r.to_dict()})
-        return jsonify(r.to_dict()), 201
+        broadcast({"type": "reservation.created", "reservation": r})
+        return jsonify(r), 201
 
     # ---------- ORDERS ----------
     @app.get("/api/orders")
+    @query_budget(3)
     def list_orders():
-        orders = Order.query.order_by(Order.id.desc()).all()
-        return jsonify([o.to_dict() for o in orders])
+        filters = {"status": request.args.get("status"), "table_id": request.args.get("table_id", type=int), "day": day_arg()}
+        if wants_stream():
+            return json_array_stream(repo.iter_orders(**filters, batch_size=app.config["STREAM_BATCH_SIZE"]))
+        return jsonify(repo.list_orders(**filters))
 
     @app.post("/api/orders")
+    @query_budget(6)
+    @idempotent
     def create_order():
         resp = require_login()
         if resp:
             return resp
         data = request.get_json(silent=True) or {}
-        o = Order(table_id=data.get("table_id"))
-        db.session.add(o)
-        db.session.flush()
-        for it in data.get("items", []):
-            if "menu_item_id" in it:
-                mi = MenuItem.query.get(it["menu_item_id"])
-                if not mi:
-                    continue
-                oi = OrderItem(
-                    order_id=o.id,
-                    menu_item_id=mi.id,
-                    name=mi.name,
-                    price=mi.price,
-                    quantity=int(it.get("quantity", 1)),
-                )
-            else:
-                oi = OrderItem(
-                    order_id=o.id,
-                    menu_item_id=None,
-                    name=it.get("name", "Custom"),
-                    price=float(it.get("price", 0)),
-                    quantity=int(it.get("quantity", 1)),
-                )
-            db.session.add(oi)
-        db.session.commit()
-        socketio.emit("event", {"type": "order.created", "order": o.to_dict()})
-        return jsonify(o.to_dict()), 201
+        try:
+            items = parse_items(data.get("items", []))
+        except (TypeError, ValueError, AttributeError):
+            abort(400)
+        o = repo.create_order(table_id=data.get("table_id"), items=items)
+        broadcast({"type": "order.created", "order": o})
+        return jsonify(o), 201
 
     @app.post("/api/orders/<int:order_id>/pay")
+    @query_budget(8)
+    @idempotent
     def pay_order(order_id):
         resp = require_login()
         if resp:
             return resp
-        order = Order.query.get_or_404(order_id)
         data = request.get_json(silent=True) or {}
-        amount = float(data.get("amount", order.total()))
-        p = Payment(order_id=order.id, amount=amount, method=data.get("method", "cash"))
-        order.status = "paid" if amount >= order.total() else "partial"
-        db.session.add(p)
-        db.session.commit()
-        socketio.emit("event", {"type": "payment.created", "order": order.to_dict(), "payment": p.to_dict()})
-        return jsonify({"order": order.to_dict(), "payment": p.to_dict()})
+        amount = number(data["amount"]) if "amount" in data else None
+        result = found(repo.pay_order(
+            order_id, amount=amount, method=data.get("method", "cash"), expected_version=if_match_version()
+        ))
+        broadcast({"type": "payment.created", **result})
+        return with_etag(result, result["order"]["version"])
+
+    # ---------- OFFLINE SYNC ----------
+    @app.post("/api/sync")
+    @query_budget(9)  # fixed: each table is written with one multi-row statement
+    @idempotent
+    def sync():
+        resp = require_login()
+        if resp:
+            return resp
+        data = request.get_json(silent=True) or {}
+        ops = data.get("operations")
+        if not isinstance(ops, list):
+            return jsonify({"error": "operations_required"}), 400
+        if len(ops) > app.config["SYNC_MAX_OPERATIONS"]:
+            return jsonify({"error": "too_many_operations", "max": app.config["SYNC_MAX_OPERATIONS"]}), 413
+        out = repo.apply_sync([parse_sync_op(op) for op in ops])
+        # one event per touched order with its final state, not one per operation
+        for order, created in out["orders"]:
+            broadcast({"type": "order.created" if created else "order.updated", "order": order})
+        return jsonify({"results": out["results"]})
 
     # ---------- REPORTS ----------
     @app.get("/api/reports/sales")
+    @query_budget(1)
     def sales_report():
-        rows = Payment.query.all()
-        by_day = {}
-        for p in rows:
-            day = p.created_at.date().isoformat()
-            by_day.setdefault(day, {"date": day, "revenue": 0.0, "payments": 0})
-            by_day[day]["revenue"] += p.amount
-            by_day[day]["payments"] += 1
-        return jsonify(sorted(by_day.values(), key=lambda x: x["date"], reverse=True))
+        return jsonify(repo.sales_by_day())
+
+    @app.get("/api/prep-list")
+    @query_budget(1)
+    def prep_list():
+        # Precomputed by `flask forecast`; defaults to tomorrow in local time
+        resp = require_login()
+        if resp:
+            return resp
+        day = day_arg() or (
+            datetime.utcnow() + timedelta(hours=app.config["FORECAST_UTC_OFFSET_HOURS"] + 24)
+        ).date()
+        return jsonify({"date": day.isoformat(), "items": repo.get_prep_list(day)})
+
+    @app.get("/api/reports/sales/all-locations")
+    @query_budget(1)  # per location, each on its own engine
+    def sales_report_all_locations():
+        resp = require_admin()
+        if resp:
+            return resp
+        per_location = sites.fan_out(lambda r: r.sales_by_day())
+        return jsonify({"total": merge_sales(per_location), "locations": per_location})
 
     # ---------- MENU UPDATE/DELETE ----------
     @app.put("/api/menu/<int:item_id>")
+    @query_budget(4)
     def update_menu(item_id):
         resp = require_admin()
         if resp:
             return resp
         data = request.get_json(silent=True) or {}
-        m = MenuItem.query.get_or_404(item_id)
-        for k in ["name", "category", "available"]:
-            if k in data:
-                setattr(m, k, data[k])
+        fields = {k: data[k] for k in ["name", "category", "available"] if k in data}
         if "price" in data:
-            m.price = float(data["price"])
-        db.session.commit()
-        socketio.emit("event", {"type": "menu.updated", "item": m.to_dict()})
-        return jsonify(m.to_dict())
+            fields["price"] = number(data["price"])
+        m = found(repo.update_menu(item_id, fields))
+        menu_index.add(m)
+        broadcast({"type": "menu.updated", "item": m})
+        return jsonify(m)
 
     @app.delete("/api/menu/<int:item_id>")
+    @query_budget(3)
     def delete_menu(item_id):
         resp = require_admin()
         if resp:
             return resp
-        m = MenuItem.query.get_or_404(item_id)
-        db.session.delete(m)
-        db.session.commit()
-        socketio.emit("event", {"type": "menu.deleted", "id": item_id})
+        found(repo.delete_menu(item_id))
+        menu_index.remove(item_id)
+        broadcast({"type": "menu.deleted", "id": item_id})
         return jsonify({"ok": True})
 
     # ---------- TABLES UPDATE/DELETE ----------
     @app.put("/api/tables/<int:table_id>")
+    @query_budget(4)
     def update_table(table_id):
         resp = require_admin()
         if resp:
             return resp
-        t = Table.query.get_or_404(table_id)
         data = request.get_json(silent=True) or {}
+        fields = {}
         if "label" in data:
-            t.label = data["label"]
+            fields["label"] = data["label"]
         if "capacity" in data:
-            t.capacity = int(data["capacity"])
+            fields["capacity"] = number(data["capacity"], int)
         if "occupied" in data:
-            t.occupied = bool(data["occupied"])
-        db.session.commit()
-        socketio.emit("event", {"type": "table.updated", "table": t.to_dict()})
-        return jsonify(t.to_dict())
+            fields["occupied"] = bool(data["occupied"])
+        t = found(repo.update_table(table_id, fields, expected_version=if_match_version()))
+        broadcast({"type": "table.updated", "table": t})
+        return with_etag(t, t["version"])
 
     @app.delete("/api/tables/<int:table_id>")
+    @query_budget(4)
     def delete_table(table_id):
         resp = require_admin()
         if resp:
             return resp
-        t = Table.query.get_or_404(table_id)
-        db.session.delete(t)
-        db.session.commit()
-        socketio.emit("event", {"type": "table.deleted", "id": table_id})
+        found(repo.delete_table(table_id))
+        broadcast({"type": "table.deleted", "id": table_id})
         return jsonify({"ok": True})
 
     # ---------- RESERVATIONS UPDATE/DELETE ----------
     @app.put("/api/reservations/<int:res_id>")
+    @query_budget(3)
     def update_reservation(res_id):
         resp = require_login()
         if resp:
             return resp
-        r = Reservation.query.get_or_404(res_id)
         data = request.get_json(silent=True) or {}
-        for k in ["name", "phone"]:
-            if k in data:
-                setattr(r, k, data[k])
+        fields = {k: data[k] for k in ["name", "phone"] if k in data}
         if "size" in data:
-            r.size = int(data["size"])
-        if "time" in data:
-            r.time = datetime.fromisoformat(data["time"]) if data["time"] else r.time
+            fields["size"] = number(data["size"], int)
+        if data.get("time"):
+            fields["time"] = datetime.fromisoformat(data["time"])
         if "table_id" in data:
-            r.table_id = data["table_id"]
-        db.session.commit()
-        socketio.emit("event", {"type": "reservation.updated", "reservation": r.to_dict()})
-        return jsonify(r.to_dict())
+            fields["table_id"] = data["table_id"]
+        r = found(repo.update_reservation(res_id, fields, expected_version=if_match_version()))
+        broadcast({"type": "reservation.updated", "reservation": r})
+        return with_etag(r, r["version"])
 
     @app.delete("/api/reservations/<int:res_id>")
+    @query_budget(3)
     def delete_reservation(res_id):
         resp = require_admin()
         if resp:
             return resp
-        r = Reservation.query.get_or_404(res_id)
-        db.session.delete(r)
-        db.session.commit()
-        socketio.emit("event", {"type": "reservation.deleted", "id": res_id})
+        found(repo.delete_reservation(res_id))
+        broadcast({"type": "reservation.deleted", "id": res_id})
         return jsonify({"ok": True})
 
     # ---------- PAYMENTS LIST ----------
     @app.get("/api/payments")
+    @query_budget(1)
     def list_payments():
-        return jsonify([p.to_dict() for p in Payment.query.order_by(Payment.id.desc()).all()])
+        filters = {"order_id": request.args.get("order_id", type=int), "day": day_arg()}
+        if wants_stream():
+            return json_array_stream(repo.iter_payments(**filters, batch_size=app.config["STREAM_BATCH_SIZE"]))
+        return jsonify(repo.list_payments(**filters))
+
+    # ---------- FLOOR ----------
+    @app.get("/api/floor")
+    @query_budget(8)  # first call only: loads tables, open orders and reservations
+    def floor_state():
+        if not floor.loaded:
+            floor.load(repo)
+        return jsonify(floor.snapshot())
 
     # ---------- HEALTH ----------
     @app.get("/api/health")
+    @query_budget(0)
     def health():
-        return jsonify({"ok": True})
+        return jsonify({"ok": True, "backend": repo.name, "location": g.location})
+
+    @app.get("/api/locations")
+    @query_budget(0)
+    def list_locations():
+        return jsonify({"current": g.location, "default": default_location, "locations": sites.names})
+
+    # ---------- CLI ----------
+    @app.cli.command("forecast")
+    @click.option("--date", "for_date", type=click.DateTime(["%Y-%m-%d"]), help="Day to plan (default: tomorrow)")
+    @click.option("--location", "only", type=click.Choice(sites.names), help="Only this location (default: all)")
+    def forecast_command(for_date, only):
+        """Update the demand model and cache the prep list (run nightly from cron)."""
+        for name in [only] if only else sites.names:
+            with sites.activated(name) as loc:
+                rows = run_forecast(
+                    loc.repo,
+                    for_date=for_date.date() if for_date else None,
+                    alpha=app.config["FORECAST_ALPHA"],
+                    safety=app.config["FORECAST_SAFETY"],
+                    utc_offset_hours=app.config["FORECAST_UTC_OFFSET_HOURS"],
+                )
+            click.echo(f"{name}: prep list: {len(rows)} items")
 
     return app
 
 
+def prepare_locations(app):
+    """Create tables on startup (if desired) and load the in-process state, per location."""
+    sites = app.extensions["locations"]
+    for name in sites.names:
+        with sites.activated(name) as loc:
+            create_schema()
+            upgrade_schema()
+            if loc.repo.name == "memory":
+                seed_defaults(loc.repo)  # nothing survives a restart, so start with a usable store
+            loc.menu_search.rebuild(loc.repo.list_menu())
+            loc.floor.load(loc.repo)
+
+
 # Create the real app object
 app = create_app()
-
-# Create tables on startup (if desired)
-with app.app_context():
-    db.create_all()
+prepare_locations(app)
 
 if __name__ == "__main__":
     # Runs with eventlet server automatically
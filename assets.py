@@ -0,0 +1,141 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+Static asset pipeline and response compression, for tablets on weak Wi-Fi.
+
+On startup every file under static/ is read once, given a content-hashed
+name (app.js -> app.3f2a9c1be0.js) and precompressed with gzip and, when
+the Brotli package is installed, brotli. url_for('static', ...) in the
+templates returns the hashed name, and those URLs are served from memory
+with "immutable" cache headers, so a browser only fetches a file again
+after its content changes. The plain names keep working with Flask's
+normal caching.
+
+compress_response() gzips or brotli-compresses large JSON and HTML bodies
+when the client's Accept-Encoding allows it.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE = {"application/json", "text/html"}
+
+
+def _encode(data, encoding, static):
+    # assets are compressed once, so they get the slow, small settings
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if static else 4)
+    return gzip.compress(data, compresslevel=9 if static else 6, mtime=0)
+
+
+def pick_encoding(offered):
+    """Best of `offered` (in preference order) allowed by Accept-Encoding, else "identity"."""
+    accepted = request.accept_encodings
+    for encoding in offered:
+        if accepted[encoding] > 0:
+            return encoding
+    return "identity"
+
+
+def _encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+class _Asset:
+    __slots__ = ("mimetype", "digest", "variants")
+
+    def __init__(self, data, mimetype, digest):
+        self.mimetype = mimetype
+        self.digest = digest
+        self.variants = {"identity": data}
+        for encoding in _encodings():
+            packed = _encode(data, encoding, static=True)
+            if len(packed) < len(data):
+                self.variants[encoding] = packed
+
+
+class StaticAssets:
+    def __init__(self, app, max_age=31536000):
+        self.max_age = max_age
+        self.manifest = {}  # "app.js" -> "app.3f2a9c1be0.js"
+        self._assets = {}   # hashed name -> _Asset
+        self._send_static = app.view_functions["static"]
+        self.build(app.static_folder)
+        app.view_functions["static"] = self.serve
+        app.url_defaults(self._hashed_url)
+
+    def build(self, folder):
+        self.manifest.clear()
+        self._assets.clear()
+        for root, _, files in os.walk(folder or ""):
+            for fname in files:
+                path = os.path.join(root, fname)
+                name = os.path.relpath(path, folder).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()[:10]
+                stem, ext = os.path.splitext(name)
+                hashed = f"{stem}.{digest}{ext}"
+                mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                self.manifest[name] = hashed
+                self._assets[hashed] = _Asset(data, mimetype, digest)
+
+    def _hashed_url(self, endpoint, values):
+        if endpoint == "static" and values.get("filename") in self.manifest:
+            values["filename"] = self.manifest[values["filename"]]
+
+    def serve(self, filename):
+        asset = self._assets.get(filename)
+        if asset is None:
+            return self._send_static(filename=filename)
+        encoding = pick_encoding([e for e in _encodings() if e in asset.variants])
+        resp = current_app.response_class(asset.variants[encoding], mimetype=asset.mimetype)
+        if encoding != "identity":
+            resp.headers["Content-Encoding"] = encoding
+        resp.vary.add("Accept-Encoding")
+        resp.headers["Cache-Control"] = f"public, max-age={self.max_age}, immutable"
+        resp.set_etag(f"{asset.digest}-{encoding}")
+        return resp.make_conditional(request)
+
+
+def compress_response(resp):
+    """after_request hook: compress big JSON/HTML bodies the client can decode.
+
+    Streamed responses (?stream=1) are left alone so rows still go out as
+    they are produced.
+    """
+    if (
+        resp.mimetype not in COMPRESSIBLE
+        or resp.is_streamed
+        or resp.direct_passthrough
+        or "Content-Encoding" in resp.headers
+        or not 200 <= resp.status_code < 300
+    ):
+        return resp
+    resp.vary.add("Accept-Encoding")
+    body = resp.get_data()
+    if len(body) < current_app.config["COMPRESS_MIN_BYTES"]:
+        return resp
+    encoding = pick_encoding(_encodings())
+    if encoding == "identity":
+        return resp
+    resp.set_data(_encode(body, encoding, static=False))
+    resp.headers["Content-Encoding"] = encoding
+    etag, weak = resp.get_etag()
+    if etag and not weak:
+        # the bytes differ from the uncompressed ones, so the tag can't stay strong
+        resp.set_etag(etag, weak=True)
+    return resp
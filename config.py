@@ -4,3 +4,26 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret-change-me")
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///srms.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # "sqlalchemy" (default) or "memory" – see repository.py
+    REPOSITORY_BACKEND = os.environ.get("SRMS_REPOSITORY", "sqlalchemy")
+    # Idempotency-Key replay cache (see idempotency.py)
+    IDEMPOTENCY_CACHE_SIZE = int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", 10000))
+    IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", 24 * 3600))
+    # Largest batch accepted by POST /api/sync
+    SYNC_MAX_OPERATIONS = int(os.environ.get("SYNC_MAX_OPERATIONS", 500))
+    # Rows fetched per round trip for ?stream=1 list responses
+    STREAM_BATCH_SIZE = int(os.environ.get("STREAM_BATCH_SIZE", 500))
+    # Demand forecast for the prep list (see forecast.py): smoothing weight per
+    # weekday, extra margin on top of the forecast, restaurant offset from UTC
+    FORECAST_ALPHA = float(os.environ.get("FORECAST_ALPHA", 0.3))
+    FORECAST_SAFETY = float(os.environ.get("FORECAST_SAFETY", 0.1))
+    FORECAST_UTC_OFFSET_HOURS = float(os.environ.get("FORECAST_UTC_OFFSET_HOURS", 0))
+    # Restaurant locations (see locations.py). The default location uses
+    # SQLALCHEMY_DATABASE_URI; extra ones are "name=database-url" pairs
+    DEFAULT_LOCATION = os.environ.get("SRMS_DEFAULT_LOCATION", "main")
+    LOCATIONS = os.environ.get("SRMS_LOCATIONS", "")
+    # Threads used to query locations in parallel for cross-location reports
+    REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", 8))
+    # Response compression and static assets (see assets.py)
+    COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+    ASSET_MAX_AGE = int(os.environ.get("ASSET_MAX_AGE", 365 * 24 * 3600))
@@ -0,0 +1,165 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+Live floor model served by GET /api/floor. For each table it tracks
+occupancy, the current open order and balance, the next reservation and
+when the party was seated.
+
+The model is built from the repository on startup and then updated from the
+same events the write routes broadcast over Socket.IO (see broadcast() in
+app.py), so hosts get the joined view without any database reads.
+"""
+
+import threading
+from bisect import insort
+from datetime import datetime, timedelta
+
+# A reservation stays "next" for a while after its time, for late arrivals.
+LATE_GRACE = timedelta(minutes=15)
+
+
+class _TableState:
+    __slots__ = ("table", "open_orders", "seated_at", "upcoming")
+
+    def __init__(self, table):
+        self.table = table
+        self.open_orders = {}  # order_id -> balance
+        self.seated_at = None
+        self.upcoming = []     # sorted [(time, res_id, reservation)]
+
+    @property
+    def occupied(self):
+        return bool(self.table.get("occupied")) or bool(self.open_orders)
+
+
+class FloorState:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self._tables = {}
+        self._reservation_table = {}  # res_id -> table_id
+        self._snapshot = None
+        self._stale_at = None
+
+    # ----- building -----
+    def load(self, repo):
+        self.rebuild(
+            repo.list_tables(),
+            repo.list_orders(status="open") + repo.list_orders(status="partial"),
+            repo.list_reservations(),
+        )
+
+    def rebuild(self, tables, open_orders, reservations):
+        with self._lock:
+            self._tables = {t["id"]: _TableState(dict(t)) for t in tables}
+            self._reservation_table = {}
+            for o in sorted(open_orders, key=lambda o: o["id"]):
+                self._track_order(o)
+            for r in reservations:
+                self._add_reservation(r)
+            self._changed()
+            self.loaded = True
+
+    def _changed(self):
+        self._snapshot = None
+
+    def _mark_seated(self, state, when):
+        if state.occupied and state.seated_at is None:
+            state.seated_at = when
+        elif not state.occupied:
+            state.seated_at = None
+
+    def _track_order(self, order):
+        state = self._tables.get(order.get("table_id"))
+        if state is None:
+            return
+        # pay_order compares each payment with the full total, so an order
+        # settled in several payments stays "partial" with nothing owed
+        if order["status"] == "paid" or (order["status"] == "partial" and order["balance"] <= 0):
+            state.open_orders.pop(order["id"], None)
+        else:
+            state.open_orders[order["id"]] = order["balance"]
+        self._mark_seated(state, datetime.fromisoformat(order["created_at"]))
+
+    def _add_reservation(self, r):
+        state = self._tables.get(r.get("table_id"))
+        if state is None:
+            return
+        when = datetime.fromisoformat(r["time"])
+        if when < datetime.utcnow() - LATE_GRACE:
+            return
+        insort(state.upcoming, (when, r["id"], r))
+        self._reservation_table[r["id"]] = r["table_id"]
+
+    def _drop_reservation(self, res_id):
+        state = self._tables.get(self._reservation_table.pop(res_id, None))
+        if state is not None:
+            state.upcoming = [u for u in state.upcoming if u[1] != res_id]
+
+    # ----- event feed -----
+    def apply(self, event):
+        """Fold one broadcast event into the model."""
+        kind = event["type"]
+        with self._lock:
+            if kind in ("table.created", "table.updated"):
+                t = event["table"]
+                state = self._tables.get(t["id"])
+                if state is None:
+                    state = self._tables[t["id"]] = _TableState(dict(t))
+                else:
+                    state.table = dict(t)
+                self._mark_seated(state, datetime.utcnow())
+            elif kind == "table.deleted":
+                state = self._tables.pop(event["id"], None)
+                for _, res_id, _ in (state.upcoming if state else []):
+                    self._reservation_table.pop(res_id, None)
+            elif kind in ("order.created", "order.updated", "payment.created"):
+                self._track_order(event["order"])
+            elif kind in ("reservation.created", "reservation.updated"):
+                self._drop_reservation(event["reservation"]["id"])
+                self._add_reservation(event["reservation"])
+            elif kind == "reservation.deleted":
+                self._drop_reservation(event["id"])
+            else:
+                return
+            self._changed()
+
+    # ----- reading -----
+    def snapshot(self):
+        """Floor state per table, newest table first like /api/tables.
+
+        The serialized list is cached until the next event, or until the
+        earliest "next reservation" on the floor goes past its grace period.
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            if self._snapshot is not None and (self._stale_at is None or now < self._stale_at):
+                return self._snapshot
+            out, stale_at = [], None
+            for table_id in sorted(self._tables, reverse=True):
+                state = self._tables[table_id]
+                while state.upcoming and state.upcoming[0][0] < now - LATE_GRACE:
+                    _, res_id, _ = state.upcoming.pop(0)
+                    self._reservation_table.pop(res_id, None)
+                nxt = state.upcoming[0] if state.upcoming else None
+                if nxt is not None and (stale_at is None or nxt[0] + LATE_GRACE < stale_at):
+                    stale_at = nxt[0] + LATE_GRACE
+                out.append({
+                    "table_id": table_id,
+                    "label": state.table["label"],
+                    "capacity": state.table["capacity"],
+                    "occupied": state.occupied,
+                    "order_id": max(state.open_orders) if state.open_orders else None,
+                    "open_orders": len(state.open_orders),
+                    "balance": sum(state.open_orders.values()),
+                    "seated_at": state.seated_at.isoformat() if state.seated_at else None,
+                    "next_reservation": (
+                        {k: nxt[2][k] for k in ("id", "name", "size", "time")} if nxt else None
+                    ),
+                })
+            self._snapshot, self._stale_at = out, stale_at
+            return out
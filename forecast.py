@@ -0,0 +1,201 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+Demand forecasting for the kitchen prep list. Order history is bucketed into
+per-item, per-weekday, per-hour quantity matrices and smoothed with a
+seasonal exponentially weighted average: each finished day updates the
+profile for its weekday only, so Mondays are forecast from past Mondays.
+
+The model is incremental. It remembers the last OrderItem id it has read
+(the watermark) plus the counts for days that are not finished yet, and is
+stored in the database between runs, so the nightly job only reads the new
+order lines. `flask forecast` runs it and caches the result in the
+PrepListEntry table, which GET /api/prep-list serves as-is.
+"""
+
+import io
+import math
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+import numpy as np
+
+HOURS = 24
+CHUNK_ROWS = 100000
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def epoch_day(day):
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+def weekday(days):
+    # 1970-01-01 was a Thursday; Monday is 0 like date.weekday()
+    return (days + 3) % 7
+
+
+class DemandModel:
+    def __init__(self, alpha=0.3, utc_offset_hours=0):
+        self.alpha = alpha
+        self.utc_offset = int(utc_offset_hours * 60)            # minutes
+        self.item_ids = np.zeros(0, dtype=np.int64)         # sorted menu item ids, one row each
+        self.level = np.zeros((0, 7, HOURS))                 # smoothed quantity per item/weekday/hour
+        self.seen = np.zeros(7, dtype=np.int64)              # finished days folded in, per weekday
+        self.pending = {}                                    # epoch day -> (items, 24) counts, not finished yet
+        self.watermark = 0
+        self.last_closed = None                              # last finished epoch day
+
+    # ----- items -----
+    def _rows_for(self, menu_item_ids):
+        new = np.setdiff1d(menu_item_ids, self.item_ids)
+        if new.size:
+            at = np.searchsorted(self.item_ids, new)
+            self.item_ids = np.insert(self.item_ids, at, new)
+            self.level = np.insert(self.level, at, 0.0, axis=0)
+            self.pending = {d: np.insert(c, at, 0.0, axis=0) for d, c in self.pending.items()}
+        return np.searchsorted(self.item_ids, menu_item_ids)
+
+    # ----- ingest -----
+    def ingest(self, rows):
+        """Fold (order_item_id, menu_item_id, quantity, created_at) rows in."""
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, CHUNK_ROWS))
+            if not chunk:
+                return
+            ids, items, qty, created = zip(*chunk)
+            # minutes since the epoch; much faster than numpy's datetime parsing
+            minutes = np.fromiter(
+                ((t.toordinal() - EPOCH_ORDINAL) * 1440 + t.hour * 60 + t.minute for t in created),
+                dtype=np.int64, count=len(created),
+            )
+            self._ingest_chunk(
+                np.asarray(items, dtype=np.int64),
+                np.asarray(qty, dtype=np.float64),
+                minutes + self.utc_offset,
+            )
+            self.watermark = max(self.watermark, max(ids))
+
+    def _ingest_chunk(self, items, qty, local_minutes):
+        rows = self._rows_for(items)
+        days, minute_of_day = np.divmod(local_minutes, 1440)
+        hours = minute_of_day // 60
+        unique_days, day_index = np.unique(days, return_inverse=True)
+        cube = np.zeros((len(self.item_ids), len(unique_days), HOURS))
+        np.add.at(cube, (rows, day_index, hours), qty)
+        for i, day in enumerate(unique_days.tolist()):
+            counts = cube[:, i, :]
+            if self.last_closed is not None and day <= self.last_closed:
+                # a line added to an old order after its day was closed
+                w = weekday(day)
+                self.level[:, w, :] += self._weight(w) * counts
+            elif day in self.pending:
+                self.pending[day] += counts
+            else:
+                self.pending[day] = counts.copy()
+
+    def _weight(self, w):
+        # plain average until a weekday has enough history to smooth over
+        return max(self.alpha, 1.0 / max(self.seen[w], 1))
+
+    # ----- closing days -----
+    def close_through(self, day):
+        """Fold every day up to and including `day` (a date) into the profiles.
+
+        Days without any orders count as zero demand for their weekday.
+        """
+        end = epoch_day(day)
+        if self.last_closed is None:
+            if not self.pending:
+                return
+            start = min(self.pending)
+        else:
+            start = self.last_closed + 1
+        zeros = np.zeros((len(self.item_ids), HOURS))
+        for d in range(start, end + 1):
+            w = weekday(d)
+            self.seen[w] += 1
+            counts = self.pending.pop(d, zeros)
+            self.level[:, w, :] += self._weight(w) * (counts - self.level[:, w, :])
+        if end >= start:
+            self.last_closed = end
+
+    # ----- output -----
+    def expected(self, day):
+        """(item_ids, expected per item per hour) for a date."""
+        return self.item_ids, self.level[:, weekday(epoch_day(day)), :]
+
+    def prep_list(self, day, menu, safety=0.1):
+        """Prep rows for a date, for available menu items with any expected demand."""
+        by_id = {m["id"]: m for m in menu}
+        item_ids, hourly = self.expected(day)
+        totals = hourly.sum(axis=1)
+        out = []
+        for i in np.flatnonzero(totals > 0).tolist():
+            item = by_id.get(int(item_ids[i]))
+            quantity = math.ceil(round(totals[i] * (1 + safety), 6))
+            if item is None or not item.get("available") or quantity == 0:
+                continue
+            out.append({
+                "menu_item_id": item["id"],
+                "name": item["name"],
+                "quantity": quantity,
+                "expected": round(float(totals[i]), 2),
+                "hourly": [round(float(x), 2) for x in hourly[i]],
+            })
+        out.sort(key=lambda r: (-r["quantity"], r["name"]))
+        return out
+
+    # ----- persistence -----
+    def to_bytes(self):
+        days = sorted(self.pending)
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            item_ids=self.item_ids,
+            level=self.level,
+            seen=self.seen,
+            pending_days=np.asarray(days, dtype=np.int64),
+            pending=np.stack([self.pending[d] for d in days]) if days else np.zeros((0, len(self.item_ids), HOURS)),
+            last_closed=np.asarray(-1 if self.last_closed is None else self.last_closed),
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data, watermark, alpha=0.3, utc_offset_hours=0):
+        model = cls(alpha, utc_offset_hours)
+        with np.load(io.BytesIO(data)) as z:
+            model.item_ids = z["item_ids"]
+            model.level = z["level"]
+            model.seen = z["seen"]
+            model.pending = {int(d): c for d, c in zip(z["pending_days"], z["pending"])}
+            last_closed = int(z["last_closed"])
+        model.last_closed = None if last_closed < 0 else last_closed
+        model.watermark = watermark
+        return model
+
+
+def run_forecast(repo, for_date=None, alpha=0.3, safety=0.1, utc_offset_hours=0, now=None):
+    """Bring the stored model up to date and cache the prep list for for_date.
+
+    for_date defaults to tomorrow in restaurant local time. Returns the rows.
+    """
+    state = repo.get_forecast_state()
+    if state is None:
+        model = DemandModel(alpha, utc_offset_hours)
+    else:
+        model = DemandModel.from_bytes(state["data"], state["watermark"], alpha, utc_offset_hours)
+    model.ingest(repo.order_item_history(after_id=model.watermark))
+
+    today = ((now or datetime.utcnow()) + timedelta(hours=utc_offset_hours)).date()
+    model.close_through(today - timedelta(days=1))
+    for_date = for_date or today + timedelta(days=1)
+
+    rows = model.prep_list(for_date, repo.list_menu(), safety)
+    repo.save_forecast_state(model.watermark, model.to_bytes())
+    repo.replace_prep_list(for_date, rows)
+    return rows
@@ -0,0 +1,143 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+Idempotency-Key support for write routes. POS clients on flaky Wi-Fi retry
+POST requests; a retry carrying the same key gets the original response
+replayed instead of creating a second order or payment.
+
+Responses are kept in a bounded, expiring LRU in front of the repository's
+persisted idempotency records, so a retry storm costs one dict lookup.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import request, session, jsonify, current_app
+
+from repository import DuplicateError
+
+REPLAYED_HEADERS = ("ETag", "Location")
+
+
+class IdempotencyStore:
+    def __init__(self, repo, capacity=10000, ttl_seconds=86400, purge_interval=600):
+        self.repo = repo
+        self.capacity = capacity
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.purge_interval = purge_interval
+        self._lru = OrderedDict()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def _expired(self, record):
+        return record["created_at"] + self.ttl < datetime.utcnow()
+
+    def get(self, key):
+        with self._lock:
+            record = self._lru.get(key)
+            if record is not None:
+                self._lru.move_to_end(key)
+        if record is None:
+            record = self.repo.get_idempotency_record(key)
+            if record is not None:
+                self._remember(key, record)
+        if record is not None and self._expired(record):
+            with self._lock:
+                self._lru.pop(key, None)
+            return None
+        return record
+
+    def _remember(self, key, record):
+        with self._lock:
+            self._lru[key] = record
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+
+    def save(self, record):
+        try:
+            self.repo.save_idempotency_record(record)
+        except DuplicateError:
+            pass  # another worker stored the same key first; either copy replays the same response
+        self._remember(record["key"], record)
+        if time.monotonic() >= self._next_purge:
+            self._next_purge = time.monotonic() + self.purge_interval
+            self.repo.delete_idempotency_records_before(datetime.utcnow() - self.ttl)
+
+    def begin(self, key):
+        """Claim a key for execution; False if a request with it is already running."""
+        with self._lock:
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+            return True
+
+    def finish(self, key):
+        with self._lock:
+            self._in_flight.discard(key)
+
+
+def _fingerprint():
+    h = hashlib.sha256()
+    h.update(request.method.encode())
+    h.update(request.path.encode())
+    h.update(request.get_data())
+    return h.hexdigest()
+
+
+def idempotent(view):
+    """Replay the stored response for a repeated Idempotency-Key.
+
+    Requests without the header run normally. Only 2xx responses are stored,
+    so a retry after an auth error or 404 still executes.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        client_key = request.headers.get("Idempotency-Key")
+        if not client_key:
+            return view(*args, **kwargs)
+        store = current_app.extensions["idempotency"]
+        key = f"{session.get('user_id')}:{client_key}"
+        fingerprint = _fingerprint()
+
+        record = store.get(key)
+        if record is None:
+            if not store.begin(key):
+                return jsonify({"error": "idempotency_key_in_use"}), 409
+            try:
+                # re-check: the request holding the key may have finished meanwhile
+                record = store.get(key)
+                if record is None:
+                    resp = current_app.make_response(view(*args, **kwargs))
+                    if 200 <= resp.status_code < 300:
+                        store.save({
+                            "key": key,
+                            "fingerprint": fingerprint,
+                            "status_code": resp.status_code,
+                            "body": resp.get_data(as_text=True),
+                            "headers": json.dumps({h: resp.headers[h] for h in REPLAYED_HEADERS if h in resp.headers}),
+                            "created_at": datetime.utcnow(),
+                        })
+                    return resp
+            finally:
+                store.finish(key)
+
+        if record["fingerprint"] != fingerprint:
+            return jsonify({"error": "idempotency_key_reused"}), 422
+        resp = current_app.response_class(record["body"], status=record["status_code"], mimetype="application/json")
+        resp.headers.update(json.loads(record["headers"] or "{}"))
+        resp.headers["Idempotent-Replayed"] = "true"
+        return resp
+
+    return wrapper
@@ -0,0 +1,135 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+Multi-location support. One deployment serves several restaurants, each with
+its own database. The default location uses SQLALCHEMY_DATABASE_URI; extra
+ones come from SRMS_LOCATIONS ("downtown=sqlite:///downtown.db,harbor=...")
+and are registered as Flask-SQLAlchemy binds, so every location gets one
+pooled engine that is reused across requests.
+
+Each request picks its location (X-Location header, ?location=, then the
+location the user logged in at) and stores it in flask.g; LocationSession in
+models.py then sends every statement to that location's engine. Per-location
+in-process state (repository, search index, floor model, idempotency cache)
+lives on a Location object. Socket.IO clients join their location's room on
+connect, so live events only reach that restaurant's tablets.
+
+Cross-location reports use fan_out(), which runs a repository call against
+every location in parallel, each in its own app context and DB session.
+"""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from flask import g, has_app_context, request, session
+
+_NAME = re.compile(r"^[a-z0-9_-]+$")
+
+
+def parse_locations(spec):
+    """Parse "name=url,name=url" into {name: url}."""
+    out = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, sep, url = part.partition("=")
+        name = name.strip().lower()
+        if not sep or not url.strip() or not _NAME.match(name):
+            raise ValueError(f"Bad SRMS_LOCATIONS entry {part.strip()!r}; expected name=database-url")
+        out[name] = url.strip()
+    return out
+
+
+def requested_location(default):
+    """Location a request asks for: X-Location header, ?location=, then the login's."""
+    return (
+        request.headers.get("X-Location")
+        or request.args.get("location")
+        or session.get("location")
+        or default
+    )
+
+
+def location_room(name):
+    """Socket.IO room of the tablets at one location."""
+    return f"location:{name}"
+
+
+class Location:
+    """Everything the routes keep per restaurant."""
+
+    def __init__(self, name, repo, idempotency, menu_search, floor):
+        self.name = name
+        self.repo = repo
+        self.idempotency = idempotency
+        self.menu_search = menu_search
+        self.floor = floor
+
+
+class LocationRegistry:
+    def __init__(self, app, default, locations, max_workers=8):
+        self.app = app
+        self.default = default
+        self._by_name = {loc.name: loc for loc in locations}
+        self.max_workers = max_workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    @property
+    def names(self):
+        return list(self._by_name)
+
+    def current(self):
+        """The request's location, or the default one outside a request."""
+        name = g.get("location") if has_app_context() else None
+        return self._by_name[name or self.default]
+
+    @contextmanager
+    def activated(self, name):
+        """Run a block against one location, in a fresh app context."""
+        with self.app.app_context():
+            g.location = name
+            yield self._by_name[name]
+
+    # ----- fan-out -----
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="srms-fanout")
+            return self._pool
+
+    def _call_at(self, name, fn):
+        with self.activated(name) as loc:
+            return fn(loc.repo)
+
+    def fan_out(self, fn, names=None):
+        """{name: fn(repo)} for every location, run in parallel."""
+        names = list(names or self._by_name)
+        if len(names) == 1:
+            return {names[0]: self._call_at(names[0], fn)}
+        pool = self._executor()
+        futures = {name: pool.submit(self._call_at, name, fn) for name in names}
+        return {name: f.result() for name, f in futures.items()}
+
+
+def merge_sales(per_location):
+    """Add sales_by_day() rows from several locations into one list, newest day first."""
+    by_day = {}
+    for rows in per_location.values():
+        for r in rows:
+            day = by_day.setdefault(r["date"], {"date": r["date"], "revenue": 0.0, "payments": 0})
+            day["revenue"] += r["revenue"]
+            day["payments"] += r["payments"]
+    return sorted(by_day.values(), key=lambda x: x["date"], reverse=True)
@@ -9,10 +9,51 @@ Contains all Flask routes for authentication, menus, tables, reservations,
 orders, payments, and reports. Includes Socket.IO event handling.
 """
 
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import inspect, text
 from datetime import datetime
+import json
 
-db = SQLAlchemy()
+
+class LocationSession(Session):
+    """Sends every statement to the current location's engine (see locations.py).
+    Extra locations are binds named after the location; the default location
+    has no bind of its own and falls through to SQLALCHEMY_DATABASE_URI."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            engine = self._db.engines.get(g.get("location"))
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": LocationSession})
+
+# Columns added after the first release. create_all() never alters existing
+# tables, so upgrade_schema() adds these to databases created before them.
+ADDED_COLUMNS = [
+    ("table", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("reservation", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("order", "version", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+
+def create_schema():
+    """Create missing tables in the current location's database."""
+    db.metadata.create_all(db.session.get_bind())
+
+def upgrade_schema():
+    insp = inspect(db.session.get_bind())
+    existing = set(insp.get_table_names())
+    for table, column, ddl in ADDED_COLUMNS:
+        if table not in existing:
+            continue
+        if column not in {c["name"] for c in insp.get_columns(table)}:
+            db.session.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl}'))
+    db.session.commit()
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -35,9 +76,11 @@ class Table(db.Model):
     label = db.Column(db.String(20), unique=True, nullable=False)
     capacity = db.Column(db.Integer, default=2)
     occupied = db.Column(db.Boolean, default=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version}
 
     def to_dict(self):
-        return {"id": self.id, "label": self.label, "capacity": self.capacity, "occupied": self.occupied}
+        return {"id": self.id, "label": self.label, "capacity": self.capacity, "occupied": self.occupied, "version": self.version}
 
 class Reservation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -47,9 +90,11 @@ class Reservation(db.Model):
     time = db.Column(db.DateTime, default=datetime.utcnow)
     table_id = db.Column(db.Integer, db.ForeignKey('table.id'), nullable=True)
     table = db.relationship('Table', backref='reservations', lazy=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version}
 
     def to_dict(self):
-        return {"id": self.id, "name": self.name, "phone": self.phone, "size": self.size, "time": self.time.isoformat(), "table_id": self.table_id}
+        return {"id": self.id, "name": self.name, "phone": self.phone, "size": self.size, "time": self.time.isoformat(), "table_id": self.table_id, "version": self.version}
 
 class Order(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -58,6 +103,8 @@ class Order(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     items = db.relationship('OrderItem', backref='order', cascade="all, delete-orphan", lazy=True)
     payments = db.relationship('Payment', backref='order', cascade="all, delete-orphan", lazy=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version}
 
     def total(self):
         return sum(oi.quantity * oi.price for oi in self.items)
@@ -67,6 +114,7 @@ class Order(db.Model):
             "id": self.id,
             "table_id": self.table_id,
             "status": self.status,
+            "version": self.version,
             "created_at": self.created_at.isoformat(),
             "items": [i.to_dict() for i in self.items],
             "payments": [p.to_dict() for p in self.payments],
@@ -77,7 +125,7 @@ class Order(db.Model):
 class OrderItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
-    menu_item_id = db.Column(db.Integer, db.ForeignKey('menu_item.id'), nullable=False)
+    menu_item_id = db.Column(db.Integer, db.ForeignKey('menu_item.id'), nullable=True)
     name = db.Column(db.String(120), nullable=False)
     price = db.Column(db.Float, nullable=False)
     quantity = db.Column(db.Integer, default=1)
@@ -94,3 +142,33 @@ class Payment(db.Model):
 
     def to_dict(self):
         return {"id": self.id, "order_id": self.order_id, "amount": self.amount, "method": self.method, "created_at": self.created_at.isoformat()}
+
+class IdempotencyRecord(db.Model):
+    key = db.Column(db.String(300), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    headers = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {"key": self.key, "fingerprint": self.fingerprint, "status_code": self.status_code, "body": self.body, "headers": self.headers, "created_at": self.created_at}
+
+class ForecastState(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    watermark = db.Column(db.Integer, nullable=False, default=0)  # last OrderItem.id folded in
+    data = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PrepListEntry(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False, index=True)
+    menu_item_id = db.Column(db.Integer, nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    expected = db.Column(db.Float, nullable=False)
+    hourly = db.Column(db.Text, nullable=False)  # JSON list of 24 expected quantities
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {"menu_item_id": self.menu_item_id, "name": self.name, "quantity": self.quantity, "expected": self.expected, "hourly": json.loads(self.hourly), "created_at": self.created_at.isoformat()}
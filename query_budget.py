@@ -0,0 +1,22 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+Declares how many SQL statements a route may issue per request (SQLAlchemy
+backend). The budget is only metadata on the view function; the test suite
+(see test/tests/conftest.py) counts statements through engine events and
+fails any request that goes over it.
+"""
+
+
+def query_budget(n):
+    """Allow n statements per request, however many rows or operations it touches."""
+
+    def decorator(view):
+        view.query_budget = n
+        return view
+
+    return decorator
@@ -0,0 +1,1056 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+Storage layer used by the API routes in app.py. Every backend exposes the same
+methods and returns plain dicts (the same shapes as the models' to_dict), so
+the routes never touch the ORM directly.
+
+  - SQLAlchemyRepository: the production backend (models.py / SQLite).
+  - MemoryRepository: dicts keyed by id plus secondary indexes by status,
+    table and date. Used for load tests and fast unit tests.
+"""
+
+import json
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.exc import StaleDataError
+
+from models import (
+    db, User, MenuItem, Table, Reservation, Order, OrderItem, Payment, IdempotencyRecord, ForecastState, PrepListEntry,
+)
+
+
+class RepositoryError(Exception):
+    pass
+
+
+class DuplicateError(RepositoryError):
+    """Raised when a write violates a uniqueness rule (e.g. table label)."""
+
+
+class MissingFieldError(RepositoryError):
+    """Raised when a write leaves a required (NOT NULL) field empty."""
+
+
+class ConflictError(RepositoryError):
+    """Raised when a versioned write loses a compare-and-swap.
+
+    ``current`` holds the row as it is now stored, so the caller can retry
+    against the latest version without another read. It is None when the
+    losing write was a batch touching several rows.
+    """
+
+    def __init__(self, current=None):
+        super().__init__(f"version conflict (current version {(current or {}).get('version')})")
+        self.current = current
+
+
+class _BatchSyncMixin:
+    """POST /api/sync support shared by both backends.
+
+    Backends provide the _sync_* primitives; this class resolves
+    client-generated ids and builds the per-operation report. Everything is
+    applied in one transaction. Operations the route could not parse arrive
+    with an "error" key and are reported without being applied.
+    """
+
+    def apply_sync(self, operations):
+        ctx = self._sync_begin(operations)
+        try:
+            results, orders = self._apply_sync(ctx, operations)
+            # serialize before committing, while everything is still loaded
+            orders = [(self._sync_order_dict(o), new) for o, new in orders]
+            self._sync_commit(ctx)
+        except Exception:
+            self._sync_rollback(ctx)
+            raise
+        return {"results": results, "orders": orders}
+
+    def _apply_sync(self, ctx, operations):
+        by_client = {}
+        results, done = [], []
+        touched, created = {}, set()
+        for i, op in enumerate(operations):
+            res = {"index": i, "op": op.get("op"), "status": "ok"}
+            results.append(res)
+            if op.get("client_id") is not None:
+                res["client_id"] = op["client_id"]
+            if op.get("error"):
+                res.update(status="error", error=op["error"])
+                continue
+            if op["op"] == "create_order":
+                order = self._sync_new_order(ctx, op["table_id"])
+                self._sync_add_items(ctx, order, op["items"])
+                if op.get("client_id") is not None:
+                    by_client[op["client_id"]] = order
+                created.add(id(order))
+            else:
+                ref = op.get("order")
+                # the batch's own client ids win, so an integer local id never
+                # lands on a server order with the same number
+                if ref in by_client:
+                    order = by_client[ref]
+                elif isinstance(ref, str):
+                    order = None
+                else:
+                    order = self._sync_find_order(ctx, ref)
+                if order is None:
+                    res.update(status="error", error="unknown_order")
+                    continue
+                if op["op"] == "add_items":
+                    self._sync_add_items(ctx, order, op["items"])
+                else:
+                    done.append((res, "payment_id", self._sync_pay(ctx, order, op["amount"], op["method"])))
+            touched[id(order)] = order
+            done.append((res, "order_id", order))
+        self._sync_flush(ctx)
+
+        # server ids exist now; map every client reference onto them
+        for res, field, obj in done:
+            res[field] = self._sync_ids(obj)
+        return results, [(o, key in created) for key, o in touched.items()]
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy backend
+# ---------------------------------------------------------------------------
+class SQLAlchemyRepository(_BatchSyncMixin):
+    name = "sqlalchemy"
+
+    def _commit(self, versioned=None):
+        """Commit the session. Orders, tables and reservations carry a
+        version_id_col, so their UPDATEs are compare-and-swap statements;
+        losing one surfaces as ConflictError with the winner's state."""
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            raise ConflictError(versioned.to_dict()) from None
+        except IntegrityError as e:
+            db.session.rollback()
+            detail = str(e.orig).upper()
+            if "UNIQUE" in detail:
+                raise DuplicateError(str(e.orig)) from e
+            if "NOT NULL" in detail or "NOT-NULL" in detail:
+                raise MissingFieldError(str(e.orig)) from e
+            raise
+
+    # ----- users -----
+    def get_user(self, user_id):
+        u = db.session.get(User, user_id)
+        return self._user_dict(u) if u else None
+
+    def get_user_by_username(self, username):
+        u = User.query.filter_by(username=username).first()
+        return self._user_dict(u) if u else None
+
+    def create_user(self, username, password_hash, role="admin"):
+        u = User(username=username, password_hash=password_hash, role=role)
+        db.session.add(u)
+        self._commit()
+        return self._user_dict(u)
+
+    @staticmethod
+    def _user_dict(u):
+        return {"id": u.id, "username": u.username, "password_hash": u.password_hash, "role": u.role}
+
+    # ----- menu -----
+    def list_menu(self):
+        return [m.to_dict() for m in MenuItem.query.order_by(MenuItem.id.desc()).all()]
+
+    def get_menu(self, item_id):
+        m = db.session.get(MenuItem, item_id)
+        return m.to_dict() if m else None
+
+    def create_menu(self, name, price, category, available):
+        m = MenuItem(name=name, price=price, category=category, available=available)
+        db.session.add(m)
+        self._commit()
+        return m.to_dict()
+
+    def update_menu(self, item_id, fields):
+        m = db.session.get(MenuItem, item_id)
+        if not m:
+            return None
+        for k, v in fields.items():
+            setattr(m, k, v)
+        self._commit()
+        return m.to_dict()
+
+    def delete_menu(self, item_id):
+        m = db.session.get(MenuItem, item_id)
+        if not m:
+            return False
+        db.session.delete(m)
+        self._commit()
+        return True
+
+    @staticmethod
+    def _check_version(obj, expected_version):
+        if expected_version is not None and obj.version != expected_version:
+            raise ConflictError(obj.to_dict())
+
+    # ----- tables -----
+    def list_tables(self):
+        return [t.to_dict() for t in Table.query.order_by(Table.id.desc()).all()]
+
+    def get_table(self, table_id):
+        t = db.session.get(Table, table_id)
+        return t.to_dict() if t else None
+
+    def create_table(self, label, capacity):
+        t = Table(label=label, capacity=capacity)
+        db.session.add(t)
+        self._commit()
+        return t.to_dict()
+
+    def update_table(self, table_id, fields, expected_version=None):
+        t = db.session.get(Table, table_id)
+        if not t:
+            return None
+        self._check_version(t, expected_version)
+        for k, v in fields.items():
+            setattr(t, k, v)
+        flag_modified(t, "label")  # every accepted PUT bumps the version
+        self._commit(versioned=t)
+        return t.to_dict()
+
+    def delete_table(self, table_id):
+        t = db.session.get(Table, table_id)
+        if not t:
+            return False
+        db.session.delete(t)
+        self._commit()
+        return True
+
+    # ----- reservations -----
+    def list_reservations(self, table_id=None, day=None):
+        q = Reservation.query
+        if table_id is not None:
+            q = q.filter(Reservation.table_id == table_id)
+        if day is not None:
+            q = q.filter(db.func.date(Reservation.time) == day.isoformat())
+        return [r.to_dict() for r in q.order_by(Reservation.id.desc()).all()]
+
+    def get_reservation(self, res_id):
+        r = db.session.get(Reservation, res_id)
+        return r.to_dict() if r else None
+
+    def create_reservation(self, name, phone, size, time, table_id):
+        r = Reservation(name=name, phone=phone, size=size, time=time, table_id=table_id)
+        db.session.add(r)
+        self._commit()
+        return r.to_dict()
+
+    def update_reservation(self, res_id, fields, expected_version=None):
+        r = db.session.get(Reservation, res_id)
+        if not r:
+            return None
+        self._check_version(r, expected_version)
+        for k, v in fields.items():
+            setattr(r, k, v)
+        flag_modified(r, "name")  # every accepted PUT bumps the version
+        self._commit(versioned=r)
+        return r.to_dict()
+
+    def delete_reservation(self, res_id):
+        r = db.session.get(Reservation, res_id)
+        if not r:
+            return False
+        db.session.delete(r)
+        self._commit()
+        return True
+
+    # ----- orders -----
+    @staticmethod
+    def _orders_query(status=None, table_id=None, day=None):
+        q = Order.query
+        if status is not None:
+            q = q.filter(Order.status == status)
+        if table_id is not None:
+            q = q.filter(Order.table_id == table_id)
+        if day is not None:
+            q = q.filter(db.func.date(Order.created_at) == day.isoformat())
+        return q.order_by(Order.id.desc())
+
+    def list_orders(self, status=None, table_id=None, day=None):
+        # to_dict() reads items and payments; load them in one query each, not per order
+        q = self._orders_query(status, table_id, day).options(selectinload(Order.items), selectinload(Order.payments))
+        return [o.to_dict() for o in q.all()]
+
+    def iter_orders(self, status=None, table_id=None, day=None, batch_size=500):
+        """Like list_orders, but walks the rows batch_size at a time.
+
+        Items and payments are selectin-loaded per batch, and finished rows
+        are only weakly held by the session, so memory stays O(batch_size).
+        """
+        q = self._orders_query(status, table_id, day)
+        q = q.options(selectinload(Order.items), selectinload(Order.payments)).yield_per(batch_size)
+        for o in q:
+            yield o.to_dict()
+
+    def get_order(self, order_id):
+        o = db.session.get(Order, order_id)
+        return o.to_dict() if o else None
+
+    @staticmethod
+    def _menu_lookup(item_lists):
+        # one query for every menu item referenced, instead of one per line
+        ids = {it["menu_item_id"] for items in item_lists for it in items if "menu_item_id" in it}
+        if not ids:
+            return {}
+        return {m.id: m for m in MenuItem.query.filter(MenuItem.id.in_(ids))}
+
+    @staticmethod
+    def _item_rows(items, menu):
+        rows = []
+        for it in items:
+            if "menu_item_id" in it:
+                mi = menu.get(it["menu_item_id"])
+                if not mi:
+                    continue
+                rows.append({"menu_item_id": mi.id, "name": mi.name, "price": mi.price, "quantity": it["quantity"]})
+            else:
+                rows.append({"menu_item_id": None, "name": it["name"], "price": it["price"], "quantity": it["quantity"]})
+        return rows
+
+    def _append_items(self, order, items, menu):
+        for row in self._item_rows(items, menu):
+            order.items.append(OrderItem(**row))
+
+    @staticmethod
+    def _record_payment(order, amount, method):
+        total = order.total()
+        amount = total if amount is None else amount
+        p = Payment(amount=amount, method=method)
+        order.payments.append(p)
+        order.status = "paid" if amount >= total else "partial"
+        # Always bump the version, even if the status is unchanged, so two
+        # terminals paying from the same snapshot cannot both commit.
+        flag_modified(order, "status")
+        return p
+
+    def create_order(self, table_id, items):
+        o = Order(table_id=table_id)
+        db.session.add(o)
+        db.session.flush()
+        rows = self._item_rows(items, self._menu_lookup([items]))
+        if rows:
+            # a single executemany for every line, however long the order;
+            # render_nulls so custom lines (no menu_item_id) are not split off
+            db.session.execute(insert(OrderItem).execution_options(render_nulls=True),
+                               [{**row, "order_id": o.id} for row in rows])
+        self._commit()
+        return o.to_dict()
+
+    def pay_order(self, order_id, amount, method, expected_version=None):
+        """Record a payment; amount=None means "pay the order total"."""
+        order = db.session.get(Order, order_id)
+        if not order:
+            return None
+        self._check_version(order, expected_version)
+        p = self._record_payment(order, amount, method)
+        self._commit(versioned=order)
+        return {"order": order.to_dict(), "payment": p.to_dict()}
+
+    # ----- batch sync -----
+    # Operations are staged as plain dicts and written by _sync_flush with one
+    # multi-row statement per table, so a batch costs the same number of
+    # statements whether it holds 3 operations or 500.
+    def _sync_begin(self, operations):
+        server_ids = {op["order"] for op in operations if isinstance(op.get("order"), int)}
+        existing = {}
+        if server_ids:
+            # payments compare against the order total, so fetch it with the row
+            q = (
+                select(Order.id, Order.version, Order.status,
+                       func.coalesce(func.sum(OrderItem.quantity * OrderItem.price), 0.0))
+                .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+                .where(Order.id.in_(server_ids))
+                .group_by(Order.id)
+            )
+            for order_id, version, status, total in db.session.execute(q):
+                existing[order_id] = self._staged_order(order_id, status, total, version=version)
+        return {
+            "menu": self._menu_lookup([op.get("items") or [] for op in operations]),
+            "existing": existing,
+            "new": [],
+        }
+
+    @staticmethod
+    def _staged_order(order_id, status, total, version=None, table_id=None):
+        return {"id": order_id, "status": status, "total": total, "version": version, "table_id": table_id,
+                "dirty": False, "items": [], "payments": [], "row": None}
+
+    def _sync_find_order(self, ctx, order_id):
+        return ctx["existing"].get(order_id)
+
+    def _sync_new_order(self, ctx, table_id):
+        o = self._staged_order(None, "open", 0.0, table_id=table_id)
+        ctx["new"].append(o)
+        return o
+
+    def _sync_add_items(self, ctx, order, items):
+        rows = self._item_rows(items, ctx["menu"])
+        order["items"] += rows
+        order["total"] += sum(r["quantity"] * r["price"] for r in rows)
+        order["dirty"] = True
+
+    def _sync_pay(self, ctx, order, amount, method):
+        amount = order["total"] if amount is None else amount
+        p = {"id": None, "order": order, "amount": amount, "method": method}
+        order["payments"].append(p)
+        order["status"] = "paid" if amount >= order["total"] else "partial"
+        order["dirty"] = True
+        return p
+
+    def _sync_flush(self, ctx):
+        now = datetime.utcnow()
+        new = ctx["new"]
+        if new:
+            ids = self._insert_returning_ids(
+                Order,
+                [{"table_id": o["table_id"], "status": o["status"], "version": 1, "created_at": now} for o in new],
+                ("table_id", "status"),
+            )
+            for o, order_id in zip(new, ids):
+                o["id"] = order_id
+
+        dirty = [o for o in ctx["existing"].values() if o["dirty"]]
+        if dirty:
+            self._sync_bump_versions(dirty)
+
+        staged = new + dirty
+        lines = [{**row, "order_id": o["id"]} for o in staged for row in o["items"]]
+        if lines:
+            db.session.execute(insert(OrderItem).execution_options(render_nulls=True), lines)
+        payments = [p for o in staged for p in o["payments"]]
+        if payments:
+            ids = self._insert_returning_ids(
+                Payment,
+                [{"order_id": p["order"]["id"], "amount": p["amount"], "method": p["method"], "created_at": now}
+                 for p in payments],
+                ("order_id", "amount", "method"),
+            )
+            for p, payment_id in zip(payments, ids):
+                p["id"] = payment_id
+
+        if staged:
+            # read the final state back for the response and the broadcasts
+            q = Order.query.options(selectinload(Order.items), selectinload(Order.payments)).populate_existing()
+            rows = {o.id: o for o in q.filter(Order.id.in_([o["id"] for o in staged]))}
+            for o in staged:
+                o["row"] = rows[o["id"]]
+
+    @staticmethod
+    def _insert_returning_ids(model, rows, match_on):
+        """INSERT rows as multi-row statements and return their ids in input order.
+
+        Asking for RETURNING in parameter order makes SQLAlchemy fall back to
+        one INSERT per row on SQLite, so ids are matched back on the inserted
+        values instead. Rows with equal values get their ids in ascending order,
+        so they still number in input order, as one INSERT each would.
+        render_nulls keeps rows with and without a NULL in the same statement.
+        """
+        cols = [getattr(model, c) for c in match_on]
+        ids = defaultdict(list)
+        stmt = insert(model).returning(model.id, *cols).execution_options(render_nulls=True)
+        for row in db.session.execute(stmt, rows):
+            ids[tuple(row[1:])].append(row[0])
+        ids = {key: deque(sorted(found)) for key, found in ids.items()}
+        return [ids[tuple(r[c] for c in match_on)].popleft() for r in rows]
+
+    @staticmethod
+    def _sync_bump_versions(orders):
+        """Compare-and-swap status/version of existing orders in one executemany."""
+        t = Order.__table__
+        stmt = (
+            update(t)
+            .where(t.c.id == bindparam("b_id"), t.c.version == bindparam("b_version"))
+            .values(status=bindparam("b_status"), version=bindparam("b_next"))
+        )
+        params = [{"b_id": o["id"], "b_version": o["version"], "b_status": o["status"], "b_next": o["version"] + 1}
+                  for o in orders]
+        if db.session.get_bind().dialect.supports_sane_multi_rowcount:
+            matched = db.session.execute(stmt, params).rowcount
+        else:
+            matched = sum(db.session.execute(stmt, p).rowcount for p in params)
+        if matched != len(params):
+            raise ConflictError()
+
+    def _sync_commit(self, ctx):
+        self._commit()
+
+    def _sync_rollback(self, ctx):
+        db.session.rollback()
+
+    def _sync_ids(self, obj):
+        return obj["id"]
+
+    def _sync_order_dict(self, order):
+        return order["row"].to_dict()
+
+    # ----- payments / reports -----
+    @staticmethod
+    def _payments_query(order_id=None, day=None):
+        q = Payment.query
+        if order_id is not None:
+            q = q.filter(Payment.order_id == order_id)
+        if day is not None:
+            q = q.filter(db.func.date(Payment.created_at) == day.isoformat())
+        return q.order_by(Payment.id.desc())
+
+    def list_payments(self, order_id=None, day=None):
+        return [p.to_dict() for p in self._payments_query(order_id, day).all()]
+
+    def iter_payments(self, order_id=None, day=None, batch_size=500):
+        for p in self._payments_query(order_id, day).yield_per(batch_size):
+            yield p.to_dict()
+
+    def sales_by_day(self):
+        by_day = {}
+        for p in Payment.query.all():
+            day = p.created_at.date().isoformat()
+            by_day.setdefault(day, {"date": day, "revenue": 0.0, "payments": 0})
+            by_day[day]["revenue"] += p.amount
+            by_day[day]["payments"] += 1
+        return sorted(by_day.values(), key=lambda x: x["date"], reverse=True)
+
+    # ----- idempotency records -----
+    def get_idempotency_record(self, key):
+        rec = db.session.get(IdempotencyRecord, key)
+        return rec.to_dict() if rec else None
+
+    def save_idempotency_record(self, record):
+        db.session.add(IdempotencyRecord(**record))
+        self._commit()
+
+    def delete_idempotency_records_before(self, cutoff):
+        IdempotencyRecord.query.filter(IdempotencyRecord.created_at < cutoff).delete()
+        self._commit()
+
+    # ----- forecasting -----
+    def order_item_history(self, after_id=0, batch_size=50000):
+        """(order_item_id, menu_item_id, quantity, order created_at) for menu
+        lines newer than after_id, oldest first, streamed in batches."""
+        q = (
+            db.session.query(OrderItem.id, OrderItem.menu_item_id, OrderItem.quantity, Order.created_at)
+            .join(Order, OrderItem.order_id == Order.id)
+            .filter(OrderItem.id > after_id, OrderItem.menu_item_id.isnot(None))
+            .order_by(OrderItem.id)
+            .yield_per(batch_size)
+        )
+        for row in q:
+            yield tuple(row)
+
+    def get_forecast_state(self):
+        st = db.session.get(ForecastState, 1)
+        return {"watermark": st.watermark, "data": st.data} if st else None
+
+    def save_forecast_state(self, watermark, data):
+        st = db.session.get(ForecastState, 1) or ForecastState(id=1)
+        st.watermark, st.data = watermark, data
+        db.session.add(st)
+        self._commit()
+
+    def get_prep_list(self, day):
+        q = PrepListEntry.query.filter_by(date=day).order_by(PrepListEntry.quantity.desc(), PrepListEntry.name)
+        return [e.to_dict() for e in q]
+
+    def replace_prep_list(self, day, rows):
+        PrepListEntry.query.filter_by(date=day).delete()
+        db.session.add_all(
+            PrepListEntry(date=day, **{**row, "hourly": json.dumps(row["hourly"])}) for row in rows
+        )
+        self._commit()
+
+
+# ---------------------------------------------------------------------------
+# In-memory backend
+# ---------------------------------------------------------------------------
+class MemoryRepository(_BatchSyncMixin):
+    """Dict-of-dicts store with secondary indexes.
+
+    Primary stores are keyed by id and keep insertion order, so "newest first"
+    listings are just a reversed walk. Secondary indexes map a status, table id
+    or calendar date to the set of matching ids and are maintained on every
+    write, so filtered lookups never scan the whole store.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._next_ids = defaultdict(lambda: 1)
+            self.users = {}
+            self.menu = {}
+            self.tables = {}
+            self.reservations = {}
+            self.orders = {}
+            self.order_items = {}
+            self.payments = {}
+            self._users_by_name = {}
+            self._tables_by_label = {}
+            self._reservations_by_table = defaultdict(set)
+            self._reservations_by_date = defaultdict(set)
+            self._orders_by_status = defaultdict(set)
+            self._orders_by_table = defaultdict(set)
+            self._orders_by_date = defaultdict(set)
+            self._items_by_order = defaultdict(list)
+            self._payments_by_order = defaultdict(list)
+            self._payments_by_date = defaultdict(list)
+            self.idempotency_records = {}
+            self.forecast_state = None
+            self.prep_lists = {}
+
+    def _new_id(self, kind):
+        i = self._next_ids[kind]
+        self._next_ids[kind] += 1
+        return i
+
+    @staticmethod
+    def _newest_first(store, ids=None):
+        if ids is None:
+            return list(reversed(store.values()))
+        return [store[i] for i in sorted(ids, reverse=True)]
+
+    @staticmethod
+    def _newest_ids(store, ids=None):
+        if ids is None:
+            return list(reversed(store))
+        return sorted(ids, reverse=True)
+
+    @staticmethod
+    def _check_version(record, expected_version, as_dict):
+        if expected_version is not None and record["version"] != expected_version:
+            raise ConflictError(as_dict(record))
+
+    @staticmethod
+    def _require(record, *names):
+        # the SQL backend gets this from the NOT NULL columns
+        missing = [n for n in names if record.get(n) is None]
+        if missing:
+            raise MissingFieldError(f"{', '.join(missing)} may not be null")
+
+    @staticmethod
+    def _intersect(*id_sets):
+        picked = [s for s in id_sets if s is not None]
+        if not picked:
+            return None
+        return set.intersection(*(set(s) for s in picked))
+
+    # ----- users -----
+    def get_user(self, user_id):
+        u = self.users.get(user_id)
+        return dict(u) if u else None
+
+    def get_user_by_username(self, username):
+        user_id = self._users_by_name.get(username)
+        return self.get_user(user_id) if user_id else None
+
+    def create_user(self, username, password_hash, role="admin"):
+        with self._lock:
+            if username in self._users_by_name:
+                raise DuplicateError(f"username {username!r} already exists")
+            u = {"id": self._new_id("users"), "username": username, "password_hash": password_hash, "role": role}
+            self.users[u["id"]] = u
+            self._users_by_name[username] = u["id"]
+            return dict(u)
+
+    # ----- menu -----
+    def list_menu(self):
+        return [dict(m) for m in self._newest_first(self.menu)]
+
+    def get_menu(self, item_id):
+        m = self.menu.get(item_id)
+        return dict(m) if m else None
+
+    def create_menu(self, name, price, category, available):
+        with self._lock:
+            self._require({"name": name, "price": price}, "name", "price")
+            m = {"id": self._new_id("menu"), "name": name, "price": price, "category": category, "available": available}
+            self.menu[m["id"]] = m
+            return dict(m)
+
+    def update_menu(self, item_id, fields):
+        with self._lock:
+            m = self.menu.get(item_id)
+            if not m:
+                return None
+            self._require({**m, **fields}, "name", "price")
+            m.update(fields)
+            return dict(m)
+
+    def delete_menu(self, item_id):
+        with self._lock:
+            return self.menu.pop(item_id, None) is not None
+
+    # ----- tables -----
+    def list_tables(self):
+        return [dict(t) for t in self._newest_first(self.tables)]
+
+    def get_table(self, table_id):
+        t = self.tables.get(table_id)
+        return dict(t) if t else None
+
+    def create_table(self, label, capacity):
+        with self._lock:
+            self._require({"label": label}, "label")
+            if label in self._tables_by_label:
+                raise DuplicateError(f"table label {label!r} already exists")
+            t = {"id": self._new_id("tables"), "label": label, "capacity": capacity, "occupied": False, "version": 1}
+            self.tables[t["id"]] = t
+            self._tables_by_label[label] = t["id"]
+            return dict(t)
+
+    def update_table(self, table_id, fields, expected_version=None):
+        with self._lock:
+            t = self.tables.get(table_id)
+            if not t:
+                return None
+            self._check_version(t, expected_version, dict)
+            self._require({**t, **fields}, "label")
+            label = fields.get("label", t["label"])
+            if label != t["label"]:
+                if label in self._tables_by_label:
+                    raise DuplicateError(f"table label {label!r} already exists")
+                del self._tables_by_label[t["label"]]
+                self._tables_by_label[label] = table_id
+            t.update(fields)
+            t["version"] += 1
+            return dict(t)
+
+    def delete_table(self, table_id):
+        with self._lock:
+            t = self.tables.pop(table_id, None)
+            if not t:
+                return False
+            del self._tables_by_label[t["label"]]
+            # as the SQL backend does through the Reservation.table backref:
+            # reservations stay, detached from the table, with a new version
+            for res_id in self._reservations_by_table.pop(table_id, set()):
+                r = self.reservations[res_id]
+                r["table_id"] = None
+                r["version"] += 1
+                self._reservations_by_table[None].add(res_id)
+            return True
+
+    # ----- reservations -----
+    @staticmethod
+    def _reservation_dict(r):
+        return {**r, "time": r["time"].isoformat()}
+
+    def _index_reservation(self, r, add=True):
+        op = "add" if add else "discard"
+        getattr(self._reservations_by_table[r["table_id"]], op)(r["id"])
+        getattr(self._reservations_by_date[r["time"].date()], op)(r["id"])
+
+    def list_reservations(self, table_id=None, day=None):
+        ids = self._intersect(
+            self._reservations_by_table.get(table_id, set()) if table_id is not None else None,
+            self._reservations_by_date.get(day, set()) if day is not None else None,
+        )
+        return [self._reservation_dict(r) for r in self._newest_first(self.reservations, ids)]
+
+    def get_reservation(self, res_id):
+        r = self.reservations.get(res_id)
+        return self._reservation_dict(r) if r else None
+
+    def create_reservation(self, name, phone, size, time, table_id):
+        with self._lock:
+            self._require({"name": name, "phone": phone, "size": size}, "name", "phone", "size")
+            r = {"id": self._new_id("reservations"), "name": name, "phone": phone, "size": size, "time": time, "table_id": table_id, "version": 1}
+            self.reservations[r["id"]] = r
+            self._index_reservation(r)
+            return self._reservation_dict(r)
+
+    def update_reservation(self, res_id, fields, expected_version=None):
+        with self._lock:
+            r = self.reservations.get(res_id)
+            if not r:
+                return None
+            self._check_version(r, expected_version, self._reservation_dict)
+            self._require({**r, **fields}, "name", "phone", "size")
+            self._index_reservation(r, add=False)
+            r.update(fields)
+            r["version"] += 1
+            self._index_reservation(r)
+            return self._reservation_dict(r)
+
+    def delete_reservation(self, res_id):
+        with self._lock:
+            r = self.reservations.pop(res_id, None)
+            if not r:
+                return False
+            self._index_reservation(r, add=False)
+            return True
+
+    # ----- orders -----
+    def _order_total(self, order_id):
+        return sum(oi["quantity"] * oi["price"] for oi in self._items_by_order[order_id])
+
+    def _order_dict(self, o):
+        items = self._items_by_order[o["id"]]
+        payments = self._payments_by_order[o["id"]]
+        total = sum(oi["quantity"] * oi["price"] for oi in items)
+        return {
+            "id": o["id"],
+            "table_id": o["table_id"],
+            "status": o["status"],
+            "version": o["version"],
+            "created_at": o["created_at"].isoformat(),
+            "items": [dict(i) for i in items],
+            "payments": [self._payment_dict(p) for p in payments],
+            "total": total,
+            "balance": max(0, total - sum(p["amount"] for p in payments)),
+        }
+
+    def _set_order_status(self, o, status):
+        self._orders_by_status[o["status"]].discard(o["id"])
+        o["status"] = status
+        self._orders_by_status[status].add(o["id"])
+
+    def _order_filter(self, status, table_id, day):
+        return self._intersect(
+            self._orders_by_status.get(status, set()) if status is not None else None,
+            self._orders_by_table.get(table_id, set()) if table_id is not None else None,
+            self._orders_by_date.get(day, set()) if day is not None else None,
+        )
+
+    def list_orders(self, status=None, table_id=None, day=None):
+        ids = self._order_filter(status, table_id, day)
+        return [self._order_dict(o) for o in self._newest_first(self.orders, ids)]
+
+    def iter_orders(self, status=None, table_id=None, day=None, batch_size=500):
+        # only the matching ids are snapshotted; each row is built as it is consumed
+        for order_id in self._newest_ids(self.orders, self._order_filter(status, table_id, day)):
+            o = self.orders.get(order_id)
+            if o is not None:
+                yield self._order_dict(o)
+
+    def get_order(self, order_id):
+        o = self.orders.get(order_id)
+        return self._order_dict(o) if o else None
+
+    def _insert_order(self, table_id):
+        o = {"id": self._new_id("orders"), "table_id": table_id, "status": "open", "version": 1, "created_at": datetime.utcnow()}
+        self.orders[o["id"]] = o
+        self._orders_by_status["open"].add(o["id"])
+        self._orders_by_table[table_id].add(o["id"])
+        self._orders_by_date[o["created_at"].date()].add(o["id"])
+        return o
+
+    def _append_items(self, o, items):
+        for it in items:
+            if "menu_item_id" in it:
+                mi = self.menu.get(it["menu_item_id"])
+                if not mi:
+                    continue
+                oi = {"menu_item_id": mi["id"], "name": mi["name"], "price": mi["price"]}
+            else:
+                oi = {"menu_item_id": None, "name": it["name"], "price": it["price"]}
+            oi = {"id": self._new_id("order_items"), "order_id": o["id"], **oi, "quantity": it["quantity"]}
+            self.order_items[oi["id"]] = oi
+            self._items_by_order[o["id"]].append(oi)
+
+    def _record_payment(self, o, amount, method):
+        total = self._order_total(o["id"])
+        amount = total if amount is None else amount
+        p = {"id": self._new_id("payments"), "order_id": o["id"], "amount": amount, "method": method, "created_at": datetime.utcnow()}
+        self.payments[p["id"]] = p
+        self._payments_by_order[o["id"]].append(p)
+        self._payments_by_date[p["created_at"].date()].append(p)
+        self._set_order_status(o, "paid" if amount >= total else "partial")
+        o["version"] += 1
+        return p
+
+    def create_order(self, table_id, items):
+        with self._lock:
+            o = self._insert_order(table_id)
+            self._append_items(o, items)
+            return self._order_dict(o)
+
+    def pay_order(self, order_id, amount, method, expected_version=None):
+        with self._lock:
+            o = self.orders.get(order_id)
+            if not o:
+                return None
+            self._check_version(o, expected_version, self._order_dict)
+            p = self._record_payment(o, amount, method)
+            return {"order": self._order_dict(o), "payment": self._payment_dict(p)}
+
+    # ----- batch sync -----
+    def _sync_begin(self, operations):
+        # held until _sync_commit, so the batch is applied atomically; every
+        # write also logs how to take it back, for _sync_rollback
+        self._lock.acquire()
+        return {"new": set(), "bumped": set(), "undo": []}
+
+    def _sync_find_order(self, ctx, order_id):
+        return self.orders.get(order_id)
+
+    def _sync_new_order(self, ctx, table_id):
+        o = self._insert_order(table_id)
+        ctx["new"].add(o["id"])
+
+        def undo():
+            del self.orders[o["id"]]
+            self._orders_by_status[o["status"]].discard(o["id"])
+            self._orders_by_table[o["table_id"]].discard(o["id"])
+            self._orders_by_date[o["created_at"].date()].discard(o["id"])
+            self._items_by_order.pop(o["id"], None)
+
+        ctx["undo"].append(undo)
+        return o
+
+    def _sync_add_items(self, ctx, order, items):
+        lines, version = self._items_by_order[order["id"]], order["version"]
+        before = len(lines)
+        self._append_items(order, items)
+        self._sync_bump(ctx, order, version)
+
+        def undo():
+            for oi in lines[before:]:
+                del self.order_items[oi["id"]]
+            del lines[before:]
+            order["version"] = version
+
+        ctx["undo"].append(undo)
+
+    def _sync_pay(self, ctx, order, amount, method):
+        status, version = order["status"], order["version"]
+        p = self._record_payment(order, amount, method)
+        self._sync_bump(ctx, order, version)
+
+        def undo():
+            del self.payments[p["id"]]
+            self._payments_by_order[order["id"]].remove(p)
+            self._payments_by_date[p["created_at"].date()].remove(p)
+            self._set_order_status(order, status)
+            order["version"] = version
+
+        ctx["undo"].append(undo)
+        return p
+
+    @staticmethod
+    def _sync_bump(ctx, order, version):
+        # like the SQL backend: an order created in the batch is written once
+        # (version 1), an existing one gets a single bump however many ops touch it
+        if order["id"] in ctx["new"]:
+            order["version"] = 1
+        elif order["id"] in ctx["bumped"]:
+            order["version"] = version
+        else:
+            order["version"] = version + 1
+            ctx["bumped"].add(order["id"])
+
+    def _sync_flush(self, ctx):
+        pass
+
+    def _sync_commit(self, ctx):
+        self._lock.release()
+
+    def _sync_rollback(self, ctx):
+        try:
+            for undo in reversed(ctx["undo"]):
+                undo()
+        finally:
+            self._lock.release()
+
+    def _sync_ids(self, obj):
+        return obj["id"]
+
+    def _sync_order_dict(self, order):
+        return self._order_dict(order)
+
+    # ----- payments / reports -----
+    @staticmethod
+    def _payment_dict(p):
+        return {**p, "created_at": p["created_at"].isoformat()}
+
+    def _payment_filter(self, order_id, day):
+        return self._intersect(
+            {p["id"] for p in self._payments_by_order.get(order_id, [])} if order_id is not None else None,
+            {p["id"] for p in self._payments_by_date.get(day, [])} if day is not None else None,
+        )
+
+    def list_payments(self, order_id=None, day=None):
+        ids = self._payment_filter(order_id, day)
+        return [self._payment_dict(p) for p in self._newest_first(self.payments, ids)]
+
+    def iter_payments(self, order_id=None, day=None, batch_size=500):
+        for payment_id in self._newest_ids(self.payments, self._payment_filter(order_id, day)):
+            p = self.payments.get(payment_id)
+            if p is not None:
+                yield self._payment_dict(p)
+
+    def sales_by_day(self):
+        out = [
+            {"date": day.isoformat(), "revenue": sum(p["amount"] for p in rows), "payments": len(rows)}
+            for day, rows in self._payments_by_date.items()
+            if rows
+        ]
+        return sorted(out, key=lambda x: x["date"], reverse=True)
+
+    # ----- idempotency records -----
+    def get_idempotency_record(self, key):
+        rec = self.idempotency_records.get(key)
+        return dict(rec) if rec else None
+
+    def save_idempotency_record(self, record):
+        with self._lock:
+            if record["key"] in self.idempotency_records:
+                raise DuplicateError(f"idempotency key {record['key']!r} already stored")
+            self.idempotency_records[record["key"]] = dict(record)
+
+    def delete_idempotency_records_before(self, cutoff):
+        with self._lock:
+            for key in [k for k, r in self.idempotency_records.items() if r["created_at"] < cutoff]:
+                del self.idempotency_records[key]
+
+    # ----- forecasting -----
+    def order_item_history(self, after_id=0, batch_size=50000):
+        for oi in list(self.order_items.values()):
+            if oi["id"] > after_id and oi["menu_item_id"] is not None:
+                yield oi["id"], oi["menu_item_id"], oi["quantity"], self.orders[oi["order_id"]]["created_at"]
+
+    def get_forecast_state(self):
+        return dict(self.forecast_state) if self.forecast_state else None
+
+    def save_forecast_state(self, watermark, data):
+        self.forecast_state = {"watermark": watermark, "data": data}
+
+    def get_prep_list(self, day):
+        rows = self.prep_lists.get(day, [])
+        return [dict(r) for r in sorted(rows, key=lambda r: (-r["quantity"], r["name"]))]
+
+    def replace_prep_list(self, day, rows):
+        now = datetime.utcnow().isoformat()
+        self.prep_lists[day] = [{**row, "created_at": now} for row in rows]
+
+
+BACKENDS = {
+    "sqlalchemy": SQLAlchemyRepository,
+    "memory": MemoryRepository,
+}
+
+
+def make_repository(name):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown repository backend {name!r}; expected one of {sorted(BACKENDS)}") from None
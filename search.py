@@ -0,0 +1,159 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong, David White Jr
+Date: October 2025
+
+Description:
+In-memory search index for menu items (name and category), used by
+GET /api/menu/search. Supports prefix matching while the server is still
+typing and tolerates small typos via a trigram index over the vocabulary.
+
+The index lives in the app process and is kept current by the menu write
+routes, so run a single worker (see wsgi.py) or rebuild it per worker.
+"""
+
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Scores per matched query term; name hits outrank category hits.
+EXACT, PREFIX, FUZZY = 3.0, 2.0, 1.0
+CATEGORY_WEIGHT = 0.5
+
+
+def tokenize(text):
+    return _WORD.findall((text or "").lower())
+
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def typo_budget(term):
+    if len(term) <= 3:
+        return 0
+    return 1 if len(term) <= 6 else 2
+
+
+class MenuSearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self._items = {}
+        self._postings = defaultdict(dict)  # word -> {item_id: field weight}
+        self._vocab = []                     # sorted words, for prefix lookups
+        self._by_trigram = defaultdict(set)  # trigram -> words
+
+    def rebuild(self, items):
+        with self._lock:
+            self._items.clear()
+            self._postings.clear()
+            self._vocab.clear()
+            self._by_trigram.clear()
+            for item in items:
+                self.add(item)
+            self.loaded = True
+
+    def add(self, item):
+        """Index (or re-index) a menu item dict."""
+        with self._lock:
+            self.remove(item["id"])
+            self._items[item["id"]] = dict(item)
+            for word in tokenize(item.get("category")):
+                self._post(word, item["id"], CATEGORY_WEIGHT)
+            for word in tokenize(item.get("name")):
+                self._post(word, item["id"], 1.0)
+
+    def remove(self, item_id):
+        with self._lock:
+            item = self._items.pop(item_id, None)
+            if item is None:
+                return
+            for word in set(tokenize(item.get("name")) + tokenize(item.get("category"))):
+                docs = self._postings.get(word)
+                if docs is None:
+                    continue
+                docs.pop(item_id, None)
+                if not docs:
+                    del self._postings[word]
+                    del self._vocab[bisect_left(self._vocab, word)]
+                    for tg in trigrams(word):
+                        self._by_trigram[tg].discard(word)
+
+    def _post(self, word, item_id, weight):
+        docs = self._postings.get(word)
+        if docs is None:
+            docs = self._postings[word] = {}
+            insort(self._vocab, word)
+            for tg in trigrams(word):
+                self._by_trigram[tg].add(word)
+        docs[item_id] = max(weight, docs.get(item_id, 0.0))
+
+    def _expand(self, term):
+        """Vocabulary words matching a query term, with their match score."""
+        matches = {}
+        i = bisect_left(self._vocab, term)
+        while i < len(self._vocab) and self._vocab[i].startswith(term):
+            word = self._vocab[i]
+            matches[word] = EXACT if word == term else PREFIX
+            i += 1
+        budget = typo_budget(term)
+        if budget:
+            grams = trigrams(term)
+            shared = defaultdict(int)
+            for tg in grams:
+                for word in self._by_trigram.get(tg, ()):
+                    shared[word] += 1
+            for word, n in shared.items():
+                if word in matches or n < len(grams) - 3 * budget:
+                    continue
+                # compare against the word's prefix too, so "margh" style
+                # partial input with a typo still finds "margherita"
+                if min(edit_distance(term, word, budget), edit_distance(term, word[:len(term)], budget)) <= budget:
+                    matches[word] = FUZZY
+        return matches
+
+    def search(self, query, available=None, limit=20):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            scores = None
+            for term in terms:
+                term_scores = defaultdict(float)
+                for word, score in self._expand(term).items():
+                    for item_id, weight in self._postings[word].items():
+                        term_scores[item_id] = max(term_scores[item_id], score * weight)
+                if scores is None:
+                    scores = dict(term_scores)
+                else:
+                    # every query term must match (AND)
+                    scores = {i: s + term_scores[i] for i, s in scores.items() if i in term_scores}
+                if not scores:
+                    return []
+            hits = [
+                self._items[i] for i in scores
+                if available is None or bool(self._items[i].get("available")) == available
+            ]
+            hits.sort(key=lambda m: (-scores[m["id"]], m["name"].lower(), m["id"]))
+            return [dict(m) for m in hits[:limit]]
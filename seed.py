@@ -1,24 +1,31 @@
 from werkzeug.security import generate_password_hash
-from models import db, User, MenuItem, Table
-from app import create_app
-
-app = create_app()
-with app.app_context():
-    db.create_all()
-    if not User.query.filter_by(username="admin").first():
-        admin = User(username="admin", password_hash=generate_password_hash("password"), role="admin")
-        db.session.add(admin)
-
-    if MenuItem.query.count() == 0:
-        items = [
-            MenuItem(name="Margherita Pizza", price=11.99, category="Pizza"),
-            MenuItem(name="Caesar Salad", price=9.50, category="Salad"),
-            MenuItem(name="Spaghetti Bolognese", price=12.25, category="Pasta"),
-        ]
-        db.session.add_all(items)
-
-    if Table.query.count() == 0:
-        db.session.add_all([Table(label="T1", capacity=4), Table(label="T2", capacity=2), Table(label="T3", capacity=6)])
-
-    db.session.commit()
-    print("Seeded. Username=admin, Password=password")
+
+
+def seed_defaults(repo):
+    """Add the admin login, a starter menu and tables to an empty store.
+
+    Goes through the repository, so it works for every backend; app.py calls
+    it at startup for the memory backend, which starts empty on every run.
+    """
+    if not repo.get_user_by_username("admin"):
+        repo.create_user("admin", generate_password_hash("password"), role="admin")
+
+    if not repo.list_menu():
+        repo.create_menu("Margherita Pizza", 11.99, "Pizza", True)
+        repo.create_menu("Caesar Salad", 9.50, "Salad", True)
+        repo.create_menu("Spaghetti Bolognese", 12.25, "Pasta", True)
+
+    if not repo.list_tables():
+        for label, capacity in (("T1", 4), ("T2", 2), ("T3", 6)):
+            repo.create_table(label, capacity)
+
+
+if __name__ == "__main__":
+    from app import app
+
+    # every location has its own database, and so its own users
+    sites = app.extensions["locations"]
+    for name in sites.names:
+        with sites.activated(name) as loc:
+            seed_defaults(loc.repo)
+        print(f"Seeded {name}. Username=admin, Password=password")
@@ -20,11 +20,23 @@ from werkzeug.security import generate_password_hash
 CWD = os.getcwd()
 TESTS_DIR = os.path.dirname(__file__)
 PROJECT_ROOT = CWD if os.path.exists(os.path.join(CWD, "requirements.txt")) or os.path.exists(os.path.join(CWD, "app.py")) else os.path.abspath(os.path.join(TESTS_DIR, os.pardir))
+# tests live in test/tests, so look further up for the project when run from elsewhere
+_up = os.path.abspath(TESTS_DIR)
+while not os.path.exists(os.path.join(PROJECT_ROOT, "app.py")) and os.path.dirname(_up) != _up:
+    _up = os.path.dirname(_up)
+    PROJECT_ROOT = _up
 
 for p in {CWD, TESTS_DIR, PROJECT_ROOT}:
     if p not in sys.path:
         sys.path.insert(0, p)
 
+# --- Keep the tests off real databases ---
+# Importing app.py builds the module-level app and creates/migrates its
+# database, so point it at a throwaway one instead of instance/srms.db (or
+# whatever DATABASE_URL / SRMS_LOCATIONS name in the developer's shell).
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+os.environ.pop("SRMS_LOCATIONS", None)
+
 # --- Try to locate the Flask app or factory in common places ---
 APP_CANDIDATES = [
     # (module, factory_attr, instance_attr)
@@ -90,7 +102,7 @@ for m in MODEL_CANDIDATES:
 if db is None or User is None:
     raise ImportError(f"Could not import db/User from any of {MODEL_CANDIDATES}. Last error: {last_model_err}")
 
-def _make_app():
+def _make_app(backend=None):
     # If it's already an app instance, return it
     try:
         from flask import Flask  # type: ignore
@@ -102,7 +114,7 @@ def _make_app():
         # treat as factory
         if callable(_app_or_factory):
             try:
-                app = _app_or_factory(testing=True)
+                app = _app_or_factory(testing=True, backend=backend)
             except TypeError:
                 # factory without testing kw
                 app = _app_or_factory()
@@ -115,14 +127,27 @@ def _make_app():
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     return app
 
+# Every test using `app` runs once per repository backend. SQL-specific tests
+# pin one with @pytest.mark.parametrize("backend", ["sqlalchemy"]);
+# SRMS_TEST_REPOSITORY=memory runs the suite on a single backend.
+BACKENDS = [os.environ["SRMS_TEST_REPOSITORY"]] if os.environ.get("SRMS_TEST_REPOSITORY") else ["sqlalchemy", "memory"]
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return request.param
+
 @pytest.fixture
-def app():
-    app = _make_app()
+def app(backend):
+    app = _make_app(backend)
     with app.app_context():
         db.drop_all()
         db.create_all()
+        repo = app.extensions.get("repository")
+        if repo is not None and repo.name != "sqlalchemy":
+            # nothing to seed through the ORM; the store starts empty
+            repo.create_user("admin", generate_password_hash("password"), role="admin")
         # seed admin user if not exists
-        if User.query.filter_by(username="admin").first() is None:
+        elif User.query.filter_by(username="admin").first() is None:
             # Handle optional role field
             kwargs = {"username": "admin", "password_hash": generate_password_hash("password")}
             if hasattr(User, "role"):
@@ -148,3 +173,78 @@ def auth_headers(client):
     if token:
         return {"Authorization": f"Bearer {token}"}
     return {}
+
+@pytest.fixture
+def login():
+    """login(client, location=None) -> client, signed in as the seeded admin
+    (at `location`, when given). For clients of apps built inside a test."""
+    def sign_in(client, location=None):
+        headers = {"X-Location": location} if location else {}
+        r = client.post("/login", json={"username": "admin", "password": "password"}, headers=headers)
+        assert r.status_code == 200, r.get_data(as_text=True)
+        return client
+    return sign_in
+
+@pytest.fixture
+def admin_client(client, login):
+    """`client`, already logged in as the seeded admin."""
+    return login(client)
+
+
+# --- SQL statement counting (query budgets) ---
+class QueryCounter:
+    """Records every SQL statement sent to an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        from sqlalchemy import event
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def __len__(self):
+        return len(self.statements)
+
+    def report(self):
+        return "\n".join(f"  {i}. {' '.join(s.split())}  {p!r}" for i, (s, p) in enumerate(self.statements, 1))
+
+
+@pytest.fixture
+def count_queries(app):
+    """count_queries() -> context manager collecting the statements run inside it."""
+    with app.app_context():
+        engine = db.engine
+    return lambda: QueryCounter(engine)
+
+
+@pytest.fixture
+def budgeted(app, client, count_queries):
+    """budgeted(method, path, **kw) -> response; fails if the request runs more
+    statements than its route declares with @query_budget."""
+    adapter = app.url_map.bind("localhost")
+
+    def request(method, path, **kwargs):
+        endpoint, _ = adapter.match(path.split("?")[0], method=method)
+        view = app.view_functions[endpoint]
+        budget = getattr(view, "query_budget", None)
+        assert budget is not None, f"route {endpoint!r} has no @query_budget"
+        with count_queries() as qc:
+            resp = client.open(path, method=method, **kwargs)
+            resp.get_data()  # drain streamed bodies inside the counter
+        assert len(qc) <= budget, (
+            f"{method} {path} ({endpoint}) ran {len(qc)} SQL statements, budget is {budget}:\n{qc.report()}"
+        )
+        resp.query_count = len(qc)
+        return resp
+
+    return request
@@ -0,0 +1,94 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Static asset and compression tests: templates link content-hashed files
+that are served precompressed with immutable caching, and large JSON
+bodies are compressed only when the client accepts it.
+"""
+
+import gzip
+import os
+import re
+
+import assets
+
+try:
+    import brotli
+except ImportError:  # optional, as in assets.py: only gzip is offered without it
+    brotli = None
+
+
+def _static(app, name):
+    with open(os.path.join(app.static_folder, name), "rb") as f:
+        return f.read()
+
+
+def test_templates_link_hashed_assets(app, client):
+    html = client.get("/login").get_data(as_text=True)
+    css = re.search(r'href="(/static/style\.[0-9a-f]{10}\.css)"', html).group(1)
+    r = client.get(css, headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200 and r.mimetype == "text/css"
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in r.headers["Cache-Control"]
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert gzip.decompress(r.data) == _static(app, "style.css")
+
+    again = client.get(css, headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_asset_encoding_negotiation(app, client):
+    js = app.extensions["assets"].manifest["app.js"]
+    raw = _static(app, "app.js")
+    br = client.get(f"/static/{js}", headers={"Accept-Encoding": "gzip, br"})
+    if brotli is None:
+        assert br.headers["Content-Encoding"] == "gzip" and gzip.decompress(br.data) == raw
+    else:
+        assert br.headers["Content-Encoding"] == "br" and brotli.decompress(br.data) == raw
+    plain = client.get(f"/static/{js}")
+    assert "Content-Encoding" not in plain.headers and plain.data == raw
+    assert br.headers["ETag"] != plain.headers["ETag"]
+    # the unhashed name still works, without the long cache lifetime
+    r = client.get("/static/app.js")
+    assert r.status_code == 200 and "immutable" not in r.headers.get("Cache-Control", "")
+    r.close()
+
+
+def test_large_json_is_compressed_when_accepted(app, admin_client):
+    for i in range(40):
+        admin_client.post("/api/menu", json={"name": f"Dish number {i}", "price": 10 + i, "category": "Mains"})
+    plain = admin_client.get("/api/menu")
+    assert "Content-Encoding" not in plain.headers
+    r = admin_client.get("/api/menu", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(r.data) == plain.data
+    assert int(r.headers["Content-Length"]) == len(r.data) < len(plain.data)
+
+    small = admin_client.get("/api/health", headers={"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in small.headers  # under COMPRESS_MIN_BYTES
+
+    app.config["COMPRESS_MIN_BYTES"] = 0
+    t = admin_client.post("/api/tables", json={"label": "T1"}).get_json()
+    r = admin_client.get(f"/api/orders?table_id={t['id']}", headers={"Accept-Encoding": "br;q=1, gzip;q=0.5"})
+    assert r.headers["Content-Encoding"] == ("gzip" if brotli is None else "br")
+    streamed = admin_client.get("/api/orders?stream=1", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in streamed.headers
+
+    # a compressed versioned body keeps its version, as a weak ETag
+    r = admin_client.put(f"/api/tables/{t['id']}", json={"occupied": True}, headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip" and r.headers["ETag"] == 'W/"2"'
+    assert admin_client.put(f"/api/tables/{t['id']}", json={"occupied": False}, headers={"If-Match": r.headers["ETag"]}).status_code == 200
+
+
+def test_without_brotli_only_gzip_is_offered(app, admin_client, monkeypatch):
+    monkeypatch.setattr(assets, "brotli", None)
+    js = app.extensions["assets"].manifest["app.js"]
+    r = admin_client.get(f"/static/{js}", headers={"Accept-Encoding": "br, gzip"})
+    assert r.headers["Content-Encoding"] == "gzip" and gzip.decompress(r.data) == _static(app, "app.js")
+    app.config["COMPRESS_MIN_BYTES"] = 0
+    r = admin_client.get("/api/menu", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in r.headers
@@ -0,0 +1,110 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Optimistic concurrency tests: version ETags, If-Match on the PUT and pay
+routes, and 409 responses carrying the current state.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from models import db, Order
+
+
+def _order(client):
+    m = client.post("/api/menu", json={"name": "Soup", "price": 8}).get_json()
+    return client.post("/api/orders", json={"items": [{"menu_item_id": m["id"], "quantity": 1}]}).get_json()
+
+
+def test_pay_with_stale_if_match_gets_409(admin_client):
+    o = _order(admin_client)
+    assert o["version"] == 1
+
+    r = admin_client.post(f"/api/orders/{o['id']}/pay", json={"amount": 3}, headers={"If-Match": '"1"'})
+    assert r.status_code == 200
+    assert r.headers["ETag"] == '"2"'
+
+    # second terminal still holds version 1
+    r = admin_client.post(f"/api/orders/{o['id']}/pay", json={"amount": 3}, headers={"If-Match": '"1"'})
+    assert r.status_code == 409
+    body = r.get_json()
+    assert body["error"] == "conflict"
+    assert body["current"]["version"] == 2
+    assert body["current"]["balance"] == 5
+    assert r.headers["ETag"] == '"2"'
+
+    # retry against the version from the 409 succeeds
+    r = admin_client.post(f"/api/orders/{o['id']}/pay", json={"amount": 5}, headers={"If-Match": r.headers["ETag"]})
+    assert r.status_code == 200
+    assert r.get_json()["order"]["balance"] == 0
+
+
+def test_bad_amounts_and_items_are_400_not_500(admin_client):
+    o = _order(admin_client)
+    for amount in (None, "abc", [5]):
+        assert admin_client.post(f"/api/orders/{o['id']}/pay", json={"amount": amount}).status_code == 400
+    assert admin_client.post("/api/orders", json={"items": [{"name": "Tea", "price": "free"}]}).status_code == 400
+    assert admin_client.post("/api/orders", json={"items": [{"menu_item_id": "1"}]}).status_code == 400
+    assert admin_client.get("/api/orders?status=paid").get_json() == []
+
+
+def test_put_table_and_reservation_if_match(admin_client):
+    t = admin_client.post("/api/tables", json={"label": "T7"}).get_json()
+    assert admin_client.put(f"/api/tables/{t['id']}", json={"occupied": True}, headers={"If-Match": "1"}).status_code == 200
+    r = admin_client.put(f"/api/tables/{t['id']}", json={"occupied": False}, headers={"If-Match": 'W/"1"'})
+    assert r.status_code == 409
+    assert r.get_json()["current"]["occupied"] is True
+    # no If-Match (or "*") keeps the old last-writer-wins behaviour
+    assert admin_client.put(f"/api/tables/{t['id']}", json={"capacity": 6}).status_code == 200
+    assert admin_client.put(f"/api/tables/{t['id']}", json={"capacity": 4}, headers={"If-Match": "*"}).get_json()["version"] == 4
+    assert admin_client.put(f"/api/tables/{t['id']}", json={}, headers={"If-Match": "abc"}).status_code == 400
+
+    res = admin_client.post("/api/reservations", json={"name": "Ann", "table_id": t["id"]}).get_json()
+    assert admin_client.put(f"/api/reservations/{res['id']}", json={"size": 4}, headers={"If-Match": '"1"'}).status_code == 200
+    assert admin_client.put(f"/api/reservations/{res['id']}", json={"size": 5}, headers={"If-Match": '"1"'}).status_code == 409
+
+
+def test_concurrent_writer_loses_compare_and_swap(tmp_path):
+    # Two independent sessions on a file database, like two gunicorn workers.
+    engine = create_engine(f"sqlite:///{tmp_path / 'cas.db'}")
+    db.metadata.create_all(engine)
+    with Session(engine) as setup:
+        setup.add(Order(id=1))
+        setup.commit()
+
+    with Session(engine) as a, Session(engine) as b:
+        oa, ob = a.get(Order, 1), b.get(Order, 1)
+        oa.status = "paid"
+        ob.status = "partial"
+        a.commit()
+        with pytest.raises(StaleDataError):
+            b.commit()
+
+    with Session(engine) as check:
+        o = check.get(Order, 1)
+        assert (o.status, o.version) == ("paid", 2)
+
+
+@pytest.mark.parametrize("backend", ["sqlalchemy"])
+def test_sync_loses_to_a_write_made_during_the_batch(app, admin_client, monkeypatch):
+    from repository import SQLAlchemyRepository
+
+    o = _order(admin_client)
+    begin = SQLAlchemyRepository._sync_begin
+
+    def begin_then_another_write(self, operations):
+        ctx = begin(self, operations)
+        db.session.execute(db.update(Order).where(Order.id == o["id"]).values(version=Order.version + 1))
+        return ctx
+
+    monkeypatch.setattr(SQLAlchemyRepository, "_sync_begin", begin_then_another_write)
+    r = admin_client.post("/api/sync", json={"operations": [{"op": "add_items", "order": o["id"], "items": [{"name": "Tea", "price": 2}]}]})
+    assert r.status_code == 409
+    monkeypatch.undo()
+    assert admin_client.get("/api/orders").get_json()[0]["total"] == 8
@@ -0,0 +1,72 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Live floor snapshot tests: /api/floor follows table, order, payment and
+reservation writes, and a rebuild from the database gives the same view.
+"""
+
+from datetime import datetime, timedelta
+
+from floor import FloorState
+
+
+def _by_label(client):
+    return {t["label"]: t for t in client.get("/api/floor").get_json()}
+
+
+def test_floor_follows_write_paths(app, admin_client):
+    t1 = admin_client.post("/api/tables", json={"label": "T1", "capacity": 4}).get_json()
+    admin_client.post("/api/tables", json={"label": "T2", "capacity": 2})
+    floor = _by_label(admin_client)
+    assert floor["T1"]["occupied"] is False and floor["T1"]["order_id"] is None
+
+    soon = (datetime.utcnow() + timedelta(hours=1)).replace(microsecond=0)
+    later = soon + timedelta(hours=2)
+    admin_client.post("/api/reservations", json={"name": "Late", "table_id": t1["id"], "time": later.isoformat()})
+    res = admin_client.post("/api/reservations", json={"name": "Soon", "table_id": t1["id"], "time": soon.isoformat()}).get_json()
+    assert _by_label(admin_client)["T1"]["next_reservation"]["name"] == "Soon"
+    admin_client.delete(f"/api/reservations/{res['id']}")
+    assert _by_label(admin_client)["T1"]["next_reservation"]["name"] == "Late"
+
+    o = admin_client.post("/api/orders", json={"table_id": t1["id"], "items": [{"name": "Wine", "price": 30, "quantity": 1}]}).get_json()
+    floor = _by_label(admin_client)
+    assert floor["T1"]["occupied"] is True
+    assert floor["T1"]["order_id"] == o["id"]
+    assert floor["T1"]["balance"] == 30
+    assert floor["T1"]["seated_at"] == o["created_at"]
+    assert floor["T2"]["occupied"] is False
+
+    admin_client.post(f"/api/orders/{o['id']}/pay", json={"amount": 10})
+    assert _by_label(admin_client)["T1"]["balance"] == 20
+
+    # the snapshot rebuilt from the database matches the event-fed one
+    with app.app_context():
+        rebuilt = FloorState()
+        rebuilt.load(app.extensions["repository"])
+    assert rebuilt.snapshot() == admin_client.get("/api/floor").get_json()
+
+    admin_client.post(f"/api/orders/{o['id']}/pay", json={"amount": 20})
+    floor = _by_label(admin_client)
+    assert floor["T1"]["occupied"] is False
+    assert floor["T1"]["seated_at"] is None and floor["T1"]["order_id"] is None
+
+    admin_client.put(f"/api/tables/{t1['id']}", json={"occupied": True})
+    assert _by_label(admin_client)["T1"]["seated_at"] is not None
+    admin_client.delete(f"/api/tables/{t1['id']}")
+    assert "T1" not in _by_label(admin_client)
+
+
+def test_snapshot_is_cached_until_an_event():
+    floor = FloorState()
+    floor.rebuild([{"id": 1, "label": "T1", "capacity": 2, "occupied": False}], [], [])
+    first = floor.snapshot()
+    assert floor.snapshot() is first
+    floor.apply({"type": "menu.created", "item": {}})
+    assert floor.snapshot() is first
+    floor.apply({"type": "table.updated", "table": {"id": 1, "label": "T1", "capacity": 2, "occupied": True}})
+    assert floor.snapshot() is not first
+    assert floor.snapshot()[0]["occupied"] is True
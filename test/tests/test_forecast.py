@@ -0,0 +1,116 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Demand forecast tests: weekday/hour profiles, incremental updates matching a
+full recomputation, persistence, and the cached prep list behind
+GET /api/prep-list and `flask forecast`.
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from forecast import DemandModel, run_forecast
+
+MONDAY = date(2025, 9, 1)
+
+
+def _history(weeks, start_id=1):
+    """Two Monday lunch pizzas and one Friday dinner pizza a week, plus soup every day at 12."""
+    rows, i = [], start_id
+    for w in range(weeks):
+        for d in range(7):
+            day = datetime.combine(MONDAY + timedelta(days=7 * w + d), datetime.min.time())
+            if d == 0:
+                rows.append((i, 1, 2, day.replace(hour=12, minute=30))); i += 1
+            if d == 4:
+                rows.append((i, 1, 1, day.replace(hour=19))); i += 1
+            rows.append((i, 2, 1, day.replace(hour=12))); i += 1
+    return rows
+
+
+def test_weekday_and_hour_profiles():
+    model = DemandModel(alpha=0.3)
+    model.ingest(_history(4))
+    model.close_through(MONDAY + timedelta(days=27))
+    ids, monday = model.expected(MONDAY)
+    assert ids.tolist() == [1, 2]
+    assert monday[0, 12] == 2 and monday[0].sum() == 2
+    assert model.expected(MONDAY + timedelta(days=4))[1][0, 19] == 1
+    assert model.expected(MONDAY + timedelta(days=1))[1][0].sum() == 0
+    assert model.watermark == len(_history(4))
+
+
+def test_incremental_matches_full_rebuild():
+    rows = _history(6)
+    full = DemandModel()
+    full.ingest(rows)
+    full.close_through(MONDAY + timedelta(days=41))
+
+    part = DemandModel()
+    part.ingest(rows[:10])
+    part.close_through(MONDAY + timedelta(days=2))
+    part = DemandModel.from_bytes(part.to_bytes(), part.watermark)
+    part.ingest(r for r in rows if r[0] > part.watermark)
+    part.close_through(MONDAY + timedelta(days=41))
+
+    assert part.watermark == full.watermark
+    assert np.allclose(part.level, full.level)
+    assert part.seen.tolist() == full.seen.tolist() == [6] * 7
+
+
+def test_empty_days_pull_the_forecast_down():
+    model = DemandModel(alpha=0.5)
+    model.ingest(_history(2))
+    model.close_through(MONDAY + timedelta(days=13))
+    before = model.expected(MONDAY)[1][0].sum()
+    model.close_through(MONDAY + timedelta(days=20))  # a week with no orders at all
+    assert model.expected(MONDAY)[1][0].sum() == before / 2
+
+
+def test_prep_list_rounds_up_with_margin():
+    model = DemandModel()
+    model.ingest(_history(3))
+    model.close_through(MONDAY + timedelta(days=20))
+    menu = [
+        {"id": 1, "name": "Pizza", "available": True},
+        {"id": 2, "name": "Soup", "available": True},
+    ]
+    rows = model.prep_list(MONDAY, menu, safety=0.1)
+    assert [(r["name"], r["quantity"], r["expected"]) for r in rows] == [("Pizza", 3, 2.0), ("Soup", 2, 1.0)]
+    assert rows[0]["hourly"][12] == 2.0 and len(rows[0]["hourly"]) == 24
+    menu[1]["available"] = False
+    assert [r["name"] for r in model.prep_list(MONDAY, menu)] == ["Pizza"]
+
+
+def test_run_forecast_and_prep_list_route(login):
+    from app import create_app
+    from werkzeug.security import generate_password_hash
+
+    app = create_app(testing=True, backend="memory")
+    repo = app.extensions["repository"]
+    repo.create_user("admin", generate_password_hash("password"))
+    pizza = repo.create_menu("Pizza", 10.0, "Mains", True)
+    for weeks_ago in (1, 2):
+        o = repo.create_order(None, [{"menu_item_id": pizza["id"], "quantity": 4}, {"name": "Tip", "price": 1.0, "quantity": 1}])
+        repo.orders[o["id"]]["created_at"] = datetime(2025, 10, 13, 18) - timedelta(weeks=weeks_ago)
+
+    rows = run_forecast(repo, now=datetime(2025, 10, 12, 22), safety=0)  # Sunday night
+    assert [(r["menu_item_id"], r["quantity"]) for r in rows] == [(pizza["id"], 4)]
+    assert repo.get_forecast_state()["watermark"] == 3
+
+    client = app.test_client()
+    assert client.get("/api/prep-list?date=2025-10-13").status_code == 401
+    login(client)
+    body = client.get("/api/prep-list?date=2025-10-13").get_json()
+    assert body["date"] == "2025-10-13"
+    assert body["items"][0]["name"] == "Pizza" and body["items"][0]["hourly"][18] == 4.0
+    assert client.get("/api/prep-list?date=2025-10-14").get_json()["items"] == []
+
+    result = app.test_cli_runner().invoke(args=["forecast", "--date", "2025-10-20"])
+    assert result.exit_code == 0, result.output
+    assert "prep list:" in result.output
@@ -0,0 +1,65 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Idempotency-Key tests: retried order and payment POSTs replay the original
+response instead of writing twice.
+"""
+
+from datetime import datetime, timedelta
+
+from idempotency import IdempotencyStore
+from repository import MemoryRepository
+
+
+def test_retried_order_and_payment_are_not_duplicated(admin_client):
+    payload = {"items": [{"name": "Soup", "price": 6, "quantity": 2}]}
+    first = admin_client.post("/api/orders", json=payload, headers={"Idempotency-Key": "abc"})
+    retry = admin_client.post("/api/orders", json=payload, headers={"Idempotency-Key": "abc"})
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(admin_client.get("/api/orders").get_json()) == 1
+
+    order_id = first.get_json()["id"]
+    pay = admin_client.post(f"/api/orders/{order_id}/pay", json={"amount": 5}, headers={"Idempotency-Key": "pay-1"})
+    again = admin_client.post(f"/api/orders/{order_id}/pay", json={"amount": 5}, headers={"Idempotency-Key": "pay-1"})
+    assert again.get_json() == pay.get_json()
+    assert again.headers["ETag"] == pay.headers["ETag"]
+    assert len(admin_client.get("/api/payments").get_json()) == 1
+
+
+def test_key_reuse_with_different_body_is_rejected(admin_client):
+    admin_client.post("/api/orders", json={"table_id": None}, headers={"Idempotency-Key": "k"})
+    r = admin_client.post("/api/orders", json={"table_id": 5}, headers={"Idempotency-Key": "k"})
+    assert r.status_code == 422
+
+
+def test_failed_requests_are_not_stored(client, login):
+    r = client.post("/api/orders", json={}, headers={"Idempotency-Key": "k"})
+    assert r.status_code == 401
+    login(client)
+    r = client.post("/api/orders", json={}, headers={"Idempotency-Key": "k"})
+    assert r.status_code == 201
+    assert "Idempotent-Replayed" not in r.headers
+
+
+def test_store_is_bounded_and_expires():
+    repo = MemoryRepository()
+    store = IdempotencyStore(repo, capacity=2, ttl_seconds=60)
+    now = datetime.utcnow()
+    for k in ("a", "b", "c"):
+        store.save({"key": k, "fingerprint": "f", "status_code": 201, "body": "{}", "headers": None, "created_at": now})
+    assert list(store._lru) == ["b", "c"]
+    # evicted from memory but still served from the persisted records
+    assert store.get("a")["key"] == "a"
+
+    repo.idempotency_records["b"]["created_at"] = now - timedelta(seconds=120)
+    assert store.get("b") is None
+
+    store._next_purge = 0
+    store.save({"key": "d", "fingerprint": "f", "status_code": 201, "body": "{}", "headers": None, "created_at": now})
+    assert "b" not in repo.idempotency_records
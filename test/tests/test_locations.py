@@ -0,0 +1,109 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Multi-location tests: requests are routed to their location's database,
+logins are scoped to a location, and the cross-location sales report merges
+every location's numbers.
+"""
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from locations import merge_sales, parse_locations
+from models import db, create_schema
+
+
+@pytest.fixture
+def sites_app(backend):
+    from app import create_app
+
+    app = create_app(testing=True, backend=backend, locations={"harbor": "sqlite://"})
+    sites = app.extensions["locations"]
+    for name in sites.names:
+        with sites.activated(name) as loc:
+            create_schema()
+            loc.repo.create_user("admin", generate_password_hash("password"))
+    return app
+
+
+def test_requests_are_routed_per_location(sites_app, login):
+    main, harbor = sites_app.test_client(), sites_app.test_client()
+    login(main)
+    login(harbor, "harbor")
+    main.post("/api/menu", json={"name": "Burger", "price": 12})
+    harbor.post("/api/menu", json={"name": "Oysters", "price": 18})
+    harbor.post("/api/menu", json={"name": "Chowder", "price": 9})
+
+    assert [m["name"] for m in main.get("/api/menu").get_json()] == ["Burger"]
+    assert [m["name"] for m in harbor.get("/api/menu").get_json()] == ["Chowder", "Oysters"]
+    assert [m["name"] for m in harbor.get("/api/menu/search?q=oyster").get_json()] == ["Oysters"]
+    assert main.get("/api/menu/search?q=oyster").get_json() == []
+    assert harbor.get("/api/health").get_json()["location"] == "harbor"
+
+    # a login only counts at the location it was made
+    assert main.post("/api/tables", json={"label": "T1"}, headers={"X-Location": "harbor"}).status_code == 401
+    assert main.get("/api/orders?location=nowhere").status_code == 404
+
+
+def test_sales_report_fans_out_across_locations(sites_app, login):
+    main, harbor = sites_app.test_client(), sites_app.test_client()
+    login(main)
+    login(harbor, "harbor")
+    for client, prices in ((main, [10, 5]), (harbor, [20])):
+        for price in prices:
+            o = client.post("/api/orders", json={"items": [{"name": "Dish", "price": price}]}).get_json()
+            client.post(f"/api/orders/{o['id']}/pay", json={"method": "card"})
+
+    report = harbor.get("/api/reports/sales/all-locations").get_json()
+    assert [r["revenue"] for r in report["locations"]["main"]] == [15.0]
+    assert [r["revenue"] for r in report["locations"]["harbor"]] == [20.0]
+    assert [(r["revenue"], r["payments"]) for r in report["total"]] == [(35.0, 3)]
+    assert main.get("/api/reports/sales").get_json()[0]["revenue"] == 15.0
+
+
+@pytest.mark.parametrize("backend", ["sqlalchemy"])  # binds only exist on the SQL backend
+def test_location_engines_are_separate_binds(sites_app):
+    sites = sites_app.extensions["locations"]
+    with sites.activated("harbor"):
+        harbor_engine = db.session.get_bind()
+    with sites.activated("main"):
+        assert db.session.get_bind() is db.engine is not harbor_engine
+        assert db.engines["harbor"] is harbor_engine  # created once, reused by every request
+
+
+def test_parse_and_merge_helpers():
+    assert parse_locations(" Downtown=sqlite:///d.db, harbor=postgresql://h/srms ,") == {
+        "downtown": "sqlite:///d.db", "harbor": "postgresql://h/srms",
+    }
+    with pytest.raises(ValueError):
+        parse_locations("no-url-here")
+    merged = merge_sales({
+        "a": [{"date": "2025-10-02", "revenue": 5.0, "payments": 1}, {"date": "2025-10-01", "revenue": 1.0, "payments": 1}],
+        "b": [{"date": "2025-10-02", "revenue": 2.5, "payments": 2}],
+    })
+    assert merged == [
+        {"date": "2025-10-02", "revenue": 7.5, "payments": 3},
+        {"date": "2025-10-01", "revenue": 1.0, "payments": 1},
+    ]
+
+
+def test_live_events_stay_at_their_location(sites_app, login):
+    from app import socketio
+
+    main, harbor = sites_app.test_client(), sites_app.test_client()
+    login(main)
+    login(harbor, "harbor")
+    main_socket = socketio.test_client(sites_app, flask_test_client=main)
+    harbor_socket = socketio.test_client(sites_app, flask_test_client=harbor)
+    guest_socket = socketio.test_client(sites_app, query_string="location=harbor")
+    assert not socketio.test_client(sites_app, query_string="location=nowhere").is_connected()
+
+    harbor.post("/api/orders", json={"items": [{"name": "Oysters", "price": 18}]})
+    assert main_socket.get_received() == []
+    for sock in (harbor_socket, guest_socket):
+        events = [m["args"][0] for m in sock.get_received()]
+        assert [(e["type"], e["location"]) for e in events] == [("order.created", "harbor")]
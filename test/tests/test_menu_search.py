@@ -0,0 +1,77 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Menu search tests: prefix matching, typo tolerance, the available filter,
+index maintenance from the menu write routes, and lookup speed.
+"""
+
+import time
+
+from search import MenuSearchIndex
+
+
+def _names(resp):
+    return [m["name"] for m in resp.get_json()]
+
+
+def test_search_route(admin_client):
+    for name, cat, avail in [
+        ("Margherita Pizza", "Pizza", True),
+        ("Pepperoni Pizza", "Pizza", False),
+        ("Caesar Salad", "Salad", True),
+        ("Spaghetti Bolognese", "Pasta", True),
+    ]:
+        admin_client.post("/api/menu", json={"name": name, "price": 10, "category": cat, "available": avail})
+
+    assert _names(admin_client.get("/api/menu/search?q=marg")) == ["Margherita Pizza"]
+    assert _names(admin_client.get("/api/menu/search?q=margarita")) == ["Margherita Pizza"]  # typo
+    assert _names(admin_client.get("/api/menu/search?q=spagetti bol")) == ["Spaghetti Bolognese"]
+    assert _names(admin_client.get("/api/menu/search?q=pizza")) == ["Margherita Pizza", "Pepperoni Pizza"]
+    assert _names(admin_client.get("/api/menu/search?q=pizza&available=true")) == ["Margherita Pizza"]
+    assert _names(admin_client.get("/api/menu/search?q=pasta")) == ["Spaghetti Bolognese"]  # by category
+    assert admin_client.get("/api/menu/search?q=").get_json() == []
+    assert _names(admin_client.get("/api/menu/search?q=pizza&limit=1")) == ["Margherita Pizza"]
+    assert _names(admin_client.get("/api/menu/search?q=pizza&limit=-3")) == ["Margherita Pizza"]  # clamped to 1
+    assert _names(admin_client.get("/api/menu/search?q=pizza&limit=0")) == ["Margherita Pizza"]
+
+    salad = admin_client.get("/api/menu/search?q=caesar").get_json()[0]
+    admin_client.put(f"/api/menu/{salad['id']}", json={"name": "Greek Salad"})
+    assert admin_client.get("/api/menu/search?q=caesar").get_json() == []
+    assert _names(admin_client.get("/api/menu/search?q=greek")) == ["Greek Salad"]
+    admin_client.delete(f"/api/menu/{salad['id']}")
+    assert admin_client.get("/api/menu/search?q=salad").get_json() == []
+
+
+def test_null_fields_are_rejected_before_reaching_the_index(admin_client):
+    m = admin_client.post("/api/menu", json={"name": "Tomato Soup", "price": 5}).get_json()
+    r = admin_client.put(f"/api/menu/{m['id']}", json={"name": None})
+    assert r.status_code == 400 and r.get_json()["error"] == "missing_field"
+    assert admin_client.put(f"/api/menu/{m['id']}", json={"price": None}).status_code == 400
+    assert admin_client.post("/api/menu", json={"name": None, "price": 3}).status_code == 400
+    assert _names(admin_client.get("/api/menu/search?q=soup")) == ["Tomato Soup"]
+
+
+def test_name_matches_rank_above_category():
+    index = MenuSearchIndex()
+    index.rebuild([
+        {"id": 1, "name": "House Special", "category": "Burger", "available": True},
+        {"id": 2, "name": "Burger Deluxe", "category": "Mains", "available": True},
+    ])
+    assert [m["id"] for m in index.search("burger")] == [2, 1]
+
+
+def test_search_thousands_of_items_is_fast():
+    words = ["spicy", "grilled", "chicken", "tofu", "noodle", "garlic", "lemon", "beef", "curry", "salad"]
+    index = MenuSearchIndex()
+    index.rebuild(
+        {"id": i, "name": f"{words[i % 10]} {words[(i // 10) % 10]} {i}", "category": words[(i // 100) % 10], "available": True}
+        for i in range(5000)
+    )
+    start = time.perf_counter()
+    for q in ("gril", "chiken", "spicy noodle", "lemn curry"):
+        assert index.search(q)
+    assert (time.perf_counter() - start) / 4 < 0.05
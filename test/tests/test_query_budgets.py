@@ -0,0 +1,125 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Query-budget regression tests. Every route declares how many SQL statements
+it may run (@query_budget in app.py); each request below runs through the
+budgeted fixture, and is repeated with more seeded rows to prove the count
+does not grow with the size of the database.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+# statement counts only mean something on the SQL backend
+pytestmark = pytest.mark.parametrize("backend", ["sqlalchemy"])
+
+
+def _seed(app, n, offset=0):
+    repo = app.extensions["repository"]
+    with app.app_context():
+        menu = [repo.create_menu(f"Dish {i}", 5.0 + i, "Mains", True) for i in range(offset, offset + n)]
+        tables = [repo.create_table(f"S{i}", 4) for i in range(offset, offset + n)]
+        when = datetime.utcnow() + timedelta(hours=2)
+        for i in range(n):
+            repo.create_reservation(f"Guest {i}", "+1", 2, when, tables[i]["id"])
+            o = repo.create_order(tables[i]["id"], [
+                {"menu_item_id": menu[i]["id"], "quantity": 2},
+                {"name": "Water", "price": 1.0, "quantity": 1},
+            ])
+            repo.pay_order(o["id"], amount=1.0, method="cash")
+        return {"menu": menu[0]["id"], "table": tables[0]["id"], "order": o["id"]}
+
+
+def _scenario(budgeted, ids):
+    """(name, response) for one request against every route."""
+    yield "index", budgeted("GET", "/")
+    yield "dashboard", budgeted("GET", "/dashboard")
+    yield "list_menu", budgeted("GET", "/api/menu")
+    yield "search_menu", budgeted("GET", "/api/menu/search?q=dish")
+    yield "create_menu", budgeted("POST", "/api/menu", json={"name": "New", "price": 3})
+    yield "update_menu", budgeted("PUT", f"/api/menu/{ids['menu']}", json={"price": 4})
+    yield "list_tables", budgeted("GET", "/api/tables")
+    new_table = budgeted("POST", "/api/tables", json={"label": "NEW"})
+    yield "create_table", new_table
+    yield "update_table", budgeted("PUT", f"/api/tables/{ids['table']}", json={"occupied": True})
+    yield "list_reservations", budgeted("GET", "/api/reservations")
+    res = budgeted("POST", "/api/reservations", json={"name": "Zed", "table_id": ids["table"]})
+    yield "create_reservation", res
+    yield "update_reservation", budgeted("PUT", f"/api/reservations/{res.get_json()['id']}", json={"size": 3})
+    yield "delete_reservation", budgeted("DELETE", f"/api/reservations/{res.get_json()['id']}")
+    yield "list_orders", budgeted("GET", "/api/orders")
+    yield "list_orders_stream", budgeted("GET", "/api/orders?stream=1")
+    yield "create_order", budgeted("POST", "/api/orders", json={
+        "table_id": ids["table"], "items": [{"menu_item_id": ids["menu"], "quantity": 1}, {"name": "Bread", "price": 2}],
+    })
+    yield "pay_order", budgeted("POST", f"/api/orders/{ids['order']}/pay", json={"amount": 2})
+    yield "sync", budgeted("POST", "/api/sync", json={"operations": [
+        {"op": "create_order", "client_id": "c", "items": [{"menu_item_id": ids["menu"]}]},
+        {"op": "pay", "order": "c"},
+        {"op": "add_items", "order": ids["order"], "items": [{"name": "Tip", "price": 1}]},
+    ]})
+    yield "sales_report", budgeted("GET", "/api/reports/sales")
+    yield "prep_list", budgeted("GET", "/api/prep-list")
+    yield "list_payments", budgeted("GET", "/api/payments")
+    yield "list_payments_stream", budgeted("GET", "/api/payments?stream=1")
+    yield "floor_state", budgeted("GET", "/api/floor")
+    yield "health", budgeted("GET", "/api/health")
+    yield "delete_table", budgeted("DELETE", f"/api/tables/{new_table.get_json()['id']}")
+    yield "delete_menu", budgeted("DELETE", f"/api/menu/{ids['menu']}")
+    yield "logout", budgeted("POST", "/logout")
+
+
+def _run(app, budgeted, n, offset=0):
+    ids = _seed(app, n, offset)
+    # warm the per-process indexes, as the startup block in app.py does
+    budgeted("GET", "/api/menu/search?q=warm")
+    budgeted("GET", "/api/floor")
+    assert budgeted("POST", "/login", json={"username": "admin", "password": "password"}).status_code == 200
+    counts = {}
+    for name, resp in _scenario(budgeted, ids):
+        assert resp.status_code < 400, f"{name}: {resp.status_code} {resp.get_data(as_text=True)}"
+        counts[name] = resp.query_count
+    return counts
+
+
+def test_every_route_declares_a_budget(app):
+    missing = [
+        rule.endpoint for rule in app.url_map.iter_rules()
+        if rule.endpoint != "static" and not hasattr(app.view_functions[rule.endpoint], "query_budget")
+    ]
+    assert missing == []
+
+
+def test_query_count_does_not_grow_with_rows(app, budgeted):
+    small = _run(app, budgeted, 3)
+    large = _run(app, budgeted, 30, offset=3)  # same routes with 11x the rows
+    grew = {k: (small[k], large[k]) for k in small if small[k] != large[k]}
+    assert grew == {}, f"statement count grew with table size: {grew}"
+
+
+def _sync_batch(ids, n):
+    """n rounds of create + add + pay, plus an append to an existing order each round."""
+    ops = []
+    for i in range(n):
+        ops += [
+            {"op": "create_order", "client_id": f"c{i}", "table_id": ids["table"], "items": [{"menu_item_id": ids["menu"]}]},
+            {"op": "add_items", "order": f"c{i}", "items": [{"name": "Bread", "price": 2}]},
+            {"op": "pay", "order": f"c{i}", "amount": 1},
+            {"op": "add_items", "order": ids["order"] - i, "items": [{"name": "Tip", "price": 1}]},
+        ]
+    return {"operations": ops}
+
+
+def test_sync_count_does_not_grow_with_batch_size(app, budgeted):
+    ids = _seed(app, 30)
+    assert budgeted("POST", "/login", json={"username": "admin", "password": "password"}).status_code == 200
+    small = budgeted("POST", "/api/sync", json=_sync_batch(ids, 1))
+    large = budgeted("POST", "/api/sync", json=_sync_batch(ids, 25))  # 100 operations
+    assert [r["status"] for r in large.get_json()["results"]] == ["ok"] * 100
+    assert small.query_count == large.query_count
+
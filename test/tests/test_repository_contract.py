@@ -0,0 +1,319 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Shared contract tests for the storage backends in repository.py. Every test
+runs once against SQLAlchemyRepository and once against MemoryRepository, so
+both backends are held to identical behavior.
+"""
+
+from datetime import datetime, date
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from repository import ConflictError, DuplicateError, MemoryRepository, MissingFieldError, SQLAlchemyRepository
+
+
+@pytest.fixture
+def repo(backend, app):
+    # `backend` comes from conftest, so each test runs once per backend
+    if backend == "memory":
+        yield MemoryRepository()
+        return
+    with app.app_context():
+        yield SQLAlchemyRepository()
+
+
+def test_users(repo):
+    u = repo.get_user_by_username("chef")
+    assert u is None
+    created = repo.create_user("chef", generate_password_hash("pw"), role="staff")
+    assert repo.get_user(created["id"])["role"] == "staff"
+    assert repo.get_user_by_username("chef")["id"] == created["id"]
+
+
+def test_menu_crud(repo):
+    a = repo.create_menu(name="Soup", price=5.0, category="Starters", available=True)
+    b = repo.create_menu(name="Steak", price=25.0, category="Mains", available=True)
+    assert [m["id"] for m in repo.list_menu()] == [b["id"], a["id"]]
+    updated = repo.update_menu(a["id"], {"price": 6.5, "available": False})
+    assert updated == {**a, "price": 6.5, "available": False}
+    assert repo.get_menu(a["id"]) == updated
+    assert repo.delete_menu(a["id"]) is True
+    assert repo.delete_menu(a["id"]) is False
+    assert repo.get_menu(a["id"]) is None
+    assert repo.update_menu(a["id"], {"name": "x"}) is None
+
+
+def test_required_fields_may_not_be_null(repo):
+    m = repo.create_menu("Soup", 4.0, "Starters", True)
+    with pytest.raises(MissingFieldError):
+        repo.update_menu(m["id"], {"name": None})
+    with pytest.raises(MissingFieldError):
+        repo.update_menu(m["id"], {"price": None})
+    with pytest.raises(MissingFieldError):
+        repo.create_menu(None, 4.0, "Starters", True)
+    assert repo.list_menu() == [m]
+
+    t = repo.create_table("T1", 2)
+    with pytest.raises(MissingFieldError):
+        repo.update_table(t["id"], {"label": None})
+    assert repo.get_table(t["id"]) == t
+
+    r = repo.create_reservation("Ann", "+1", 2, datetime(2025, 10, 1, 19), t["id"])
+    with pytest.raises(MissingFieldError):
+        repo.update_reservation(r["id"], {"phone": None})
+    assert repo.get_reservation(r["id"]) == r
+
+
+def test_table_labels_are_unique(repo):
+    t1 = repo.create_table(label="T1", capacity=4)
+    t2 = repo.create_table(label="T2", capacity=2)
+    assert t1["occupied"] is False
+    with pytest.raises(DuplicateError):
+        repo.create_table(label="T1", capacity=2)
+    with pytest.raises(DuplicateError):
+        repo.update_table(t2["id"], {"label": "T1"})
+    assert repo.update_table(t2["id"], {"label": "T3", "occupied": True})["occupied"] is True
+    assert repo.delete_table(t1["id"]) is True
+    # label is free again once its table is gone
+    assert repo.create_table(label="T1", capacity=2)["label"] == "T1"
+
+
+def test_deleting_a_table_detaches_its_reservations(repo):
+    t = repo.create_table("T1", 4)
+    other = repo.create_table("T2", 2)
+    r = repo.create_reservation("Ann", "+1", 2, datetime(2025, 10, 1, 19), t["id"])
+    kept = repo.create_reservation("Bob", "+1", 2, datetime(2025, 10, 1, 20), other["id"])
+    assert repo.delete_table(t["id"]) is True
+    assert repo.get_reservation(r["id"]) == {**r, "table_id": None, "version": r["version"] + 1}
+    assert repo.get_reservation(kept["id"]) == kept
+    assert repo.list_reservations(table_id=t["id"]) == []
+    assert [x["id"] for x in repo.list_reservations()] == [kept["id"], r["id"]]
+
+
+def test_reservation_filters(repo):
+    t = repo.create_table(label="T1", capacity=4)
+    r1 = repo.create_reservation("Ann", "+1", 2, datetime(2025, 10, 1, 19, 0), t["id"])
+    r2 = repo.create_reservation("Bob", "+1", 4, datetime(2025, 10, 2, 19, 0), None)
+    assert [r["id"] for r in repo.list_reservations()] == [r2["id"], r1["id"]]
+    assert [r["id"] for r in repo.list_reservations(table_id=t["id"])] == [r1["id"]]
+    assert [r["id"] for r in repo.list_reservations(day=date(2025, 10, 2))] == [r2["id"]]
+
+    moved = repo.update_reservation(r2["id"], {"time": datetime(2025, 10, 1, 20, 0), "table_id": t["id"]})
+    assert moved["time"] == "2025-10-01T20:00:00"
+    assert [r["id"] for r in repo.list_reservations(table_id=t["id"], day=date(2025, 10, 1))] == [r2["id"], r1["id"]]
+    assert repo.list_reservations(day=date(2025, 10, 2)) == []
+
+    assert repo.delete_reservation(r1["id"]) is True
+    assert repo.get_reservation(r1["id"]) is None
+
+
+def test_order_and_payment_flow(repo):
+    t = repo.create_table(label="T1", capacity=4)
+    m = repo.create_menu(name="Pizza", price=10.0, category="Pizza", available=True)
+    o = repo.create_order(t["id"], [
+        {"menu_item_id": m["id"], "quantity": 2},
+        {"menu_item_id": 9999, "quantity": 1},  # unknown items are skipped
+        {"name": "Corkage", "price": 5.0, "quantity": 1},
+    ])
+    assert o["status"] == "open"
+    assert o["total"] == 25.0 and o["balance"] == 25.0
+    assert [(i["name"], i["menu_item_id"]) for i in o["items"]] == [("Pizza", m["id"]), ("Corkage", None)]
+
+    partial = repo.pay_order(o["id"], amount=10.0, method="card")
+    assert partial["order"]["status"] == "partial"
+    assert partial["order"]["balance"] == 15.0
+    assert partial["payment"]["amount"] == 10.0
+
+    full = repo.pay_order(o["id"], amount=None, method="cash")
+    assert full["payment"]["amount"] == 25.0
+    assert full["order"]["status"] == "paid"
+    assert full["order"]["balance"] == 0
+    assert repo.pay_order(12345, amount=None, method="cash") is None
+
+    assert repo.get_order(o["id"]) == full["order"]
+    assert [p["amount"] for p in repo.list_payments(order_id=o["id"])] == [25.0, 10.0]
+
+
+def test_order_filters(repo):
+    t1 = repo.create_table(label="T1", capacity=4)
+    t2 = repo.create_table(label="T2", capacity=4)
+    o1 = repo.create_order(t1["id"], [{"name": "Tea", "price": 2.0, "quantity": 1}])
+    o2 = repo.create_order(t2["id"], [{"name": "Tea", "price": 2.0, "quantity": 1}])
+    o3 = repo.create_order(t1["id"], [{"name": "Tea", "price": 2.0, "quantity": 1}])
+    repo.pay_order(o3["id"], amount=None, method="cash")
+
+    ids = lambda rows: [r["id"] for r in rows]
+    assert ids(repo.list_orders()) == [o3["id"], o2["id"], o1["id"]]
+    assert ids(repo.list_orders(status="open")) == [o2["id"], o1["id"]]
+    assert ids(repo.list_orders(table_id=t1["id"])) == [o3["id"], o1["id"]]
+    assert ids(repo.list_orders(status="open", table_id=t1["id"])) == [o1["id"]]
+    assert ids(repo.list_orders(day=datetime.utcnow().date())) == [o3["id"], o2["id"], o1["id"]]
+    assert repo.list_orders(day=date(2000, 1, 1)) == []
+
+
+def test_sales_by_day(repo):
+    o = repo.create_order(None, [{"name": "Tea", "price": 3.0, "quantity": 2}])
+    repo.pay_order(o["id"], amount=4.0, method="cash")
+    repo.pay_order(o["id"], amount=2.0, method="cash")
+    today = datetime.utcnow().date().isoformat()
+    assert repo.sales_by_day() == [{"date": today, "revenue": 6.0, "payments": 2}]
+    assert len(repo.list_payments(day=datetime.utcnow().date())) == 2
+
+
+def test_memory_backend_starts_seeded(login):
+    from app import create_app, prepare_locations
+
+    app = create_app(testing=True, backend="memory")
+    prepare_locations(app)
+    client = app.test_client()
+    assert client.get("/api/health").get_json()["backend"] == "memory"
+    login(client)
+    assert len(client.get("/api/menu").get_json()) == 3
+    assert [m["name"] for m in client.get("/api/menu/search?q=pizza").get_json()] == ["Margherita Pizza"]
+    assert client.post("/api/tables", json={"label": "T1"}).status_code == 409
+
+    # running it again (a second worker, a reload) adds nothing
+    prepare_locations(app)
+    assert len(app.extensions["repository"].list_tables()) == 3
+
+
+def test_versioned_writes_compare_and_swap(repo):
+    t = repo.create_table(label="T1", capacity=4)
+    assert t["version"] == 1
+    t = repo.update_table(t["id"], {"occupied": True}, expected_version=1)
+    assert t["version"] == 2
+    with pytest.raises(ConflictError) as exc:
+        repo.update_table(t["id"], {"occupied": False}, expected_version=1)
+    assert exc.value.current == t
+
+    r = repo.create_reservation("Ann", "+1", 2, datetime(2025, 10, 1, 19, 0), t["id"])
+    assert repo.update_reservation(r["id"], {}, expected_version=1)["version"] == 2
+    with pytest.raises(ConflictError):
+        repo.update_reservation(r["id"], {"size": 3}, expected_version=1)
+
+    o = repo.create_order(t["id"], [{"name": "Tea", "price": 2.0, "quantity": 1}])
+    first = repo.pay_order(o["id"], amount=1.0, method="cash", expected_version=1)
+    assert first["order"]["version"] == 2
+    with pytest.raises(ConflictError) as exc:
+        repo.pay_order(o["id"], amount=1.0, method="cash", expected_version=1)
+    assert exc.value.current["balance"] == 1.0
+    assert len(repo.list_payments(order_id=o["id"])) == 1
+
+
+def test_apply_sync_maps_client_ids(repo):
+    m = repo.create_menu(name="Pizza", price=10.0, category="Pizza", available=True)
+    existing = repo.create_order(None, [{"name": "Tea", "price": 2.0, "quantity": 1}])
+    out = repo.apply_sync([
+        {"op": "create_order", "client_id": "c1", "table_id": None, "items": [{"menu_item_id": m["id"], "quantity": 1}]},
+        {"op": "add_items", "order": "c1", "items": [{"name": "Cola", "price": 3.0, "quantity": 2}]},
+        {"op": "pay", "client_id": "p1", "order": "c1", "amount": None, "method": "card"},
+        {"op": "pay", "order": "nope", "amount": 1.0, "method": "cash"},
+        {"op": "add_items", "order": existing["id"], "items": [{"name": "Cake", "price": 4.0, "quantity": 1}]},
+        {"op": "refund", "error": "unknown_op"},
+    ])
+    results = out["results"]
+    assert [r["status"] for r in results] == ["ok", "ok", "ok", "error", "ok", "error"]
+    new_id = results[0]["order_id"]
+    assert results[1]["order_id"] == results[2]["order_id"] == new_id
+    assert results[0]["client_id"] == "c1" and results[2]["client_id"] == "p1"
+    assert results[3]["error"] == "unknown_order"
+
+    new_order = repo.get_order(new_id)
+    assert new_order["total"] == 16.0 and new_order["status"] == "paid" and new_order["version"] == 1
+    assert new_order["payments"][0]["id"] == results[2]["payment_id"]
+    assert repo.get_order(existing["id"])["total"] == 6.0
+    assert repo.get_order(existing["id"])["version"] == 2
+    assert sorted((o["id"], created) for o, created in out["orders"]) == [(existing["id"], False), (new_id, True)]
+
+
+def test_apply_sync_bumps_an_existing_order_once(repo):
+    existing = repo.create_order(None, [{"name": "Tea", "price": 2.0, "quantity": 1}])
+    out = repo.apply_sync([
+        {"op": "add_items", "order": existing["id"], "items": [{"name": "Cake", "price": 4.0, "quantity": 1}]},
+        {"op": "pay", "order": existing["id"], "amount": 1.0, "method": "cash"},
+        {"op": "add_items", "order": existing["id"], "items": [{"name": "Cola", "price": 3.0, "quantity": 1}]},
+        {"op": "pay", "order": existing["id"], "amount": None, "method": "card"},
+    ])
+    assert [r["status"] for r in out["results"]] == ["ok"] * 4
+    order = repo.get_order(existing["id"])
+    assert order["version"] == 2 and order["status"] == "paid" and order["total"] == 9.0
+    assert dict(out["orders"][0][0])["version"] == 2
+    # the next batch bumps it once more
+    repo.apply_sync([{"op": "add_items", "order": existing["id"], "items": [{"name": "Tea", "price": 2.0, "quantity": 1}]}])
+    assert repo.get_order(existing["id"])["version"] == 3
+
+
+def test_iter_matches_list(repo):
+    for i in range(7):
+        o = repo.create_order(None, [{"name": "Tea", "price": 2.0, "quantity": i + 1}])
+        if i % 2:
+            repo.pay_order(o["id"], amount=None, method="cash")
+    assert list(repo.iter_orders(batch_size=3)) == repo.list_orders()
+    assert list(repo.iter_orders(status="paid", batch_size=2)) == repo.list_orders(status="paid")
+    assert list(repo.iter_payments(batch_size=2)) == repo.list_payments()
+
+
+def test_forecast_storage(repo):
+    m = repo.create_menu(name="Pizza", price=10.0, category="Pizza", available=True)
+    o = repo.create_order(None, [{"menu_item_id": m["id"], "quantity": 2}, {"name": "Tip", "price": 1.0, "quantity": 1}])
+    history = list(repo.order_item_history())
+    assert [(r[1], r[2]) for r in history] == [(m["id"], 2)]
+    assert history[0][3].isoformat() == o["created_at"]
+    assert list(repo.order_item_history(after_id=history[0][0])) == []
+
+    assert repo.get_forecast_state() is None
+    repo.save_forecast_state(7, b"v1")
+    repo.save_forecast_state(9, b"v2")
+    assert repo.get_forecast_state() == {"watermark": 9, "data": b"v2"}
+
+    day = date(2025, 10, 13)
+    row = {"menu_item_id": m["id"], "name": "Pizza", "quantity": 3, "expected": 2.5, "hourly": [0.0] * 24}
+    repo.replace_prep_list(day, [row, {**row, "name": "Soup", "quantity": 5}])
+    repo.replace_prep_list(day, [row])
+    assert [(r["name"], r["quantity"], r["hourly"]) for r in repo.get_prep_list(day)] == [("Pizza", 3, [0.0] * 24)]
+    assert repo.get_prep_list(date(2025, 10, 14)) == []
+
+
+def test_apply_sync_failure_leaves_nothing_behind(repo):
+    m = repo.create_menu(name="Pizza", price=10.0, category="Pizza", available=True)
+    existing = repo.create_order(None, [{"name": "Tea", "price": 2.0, "quantity": 1}])
+    before = (repo.list_orders(), repo.list_payments(), repo.sales_by_day())
+    with pytest.raises(TypeError):
+        repo.apply_sync([
+            {"op": "create_order", "client_id": "c1", "table_id": None, "items": [{"menu_item_id": m["id"], "quantity": 1}]},
+            {"op": "pay", "order": "c1", "amount": None, "method": "card"},
+            {"op": "add_items", "order": existing["id"], "items": [{"name": "Cake", "price": 4.0, "quantity": 1}]},
+            {"op": "pay", "order": existing["id"], "amount": 1.0, "method": "cash"},
+            # not a valid reference; the route rejects these, so only a bug can get here
+            {"op": "pay", "order": {"x": 1}, "amount": None, "method": "cash"},
+        ])
+    assert (repo.list_orders(), repo.list_payments(), repo.sales_by_day()) == before
+    assert repo.get_order(existing["id"]) == existing
+
+
+def test_apply_sync_maps_ids_across_a_large_batch(repo):
+    tables = [repo.create_table(label=f"T{i}", capacity=4) for i in range(3)]
+    ops = []
+    for i in range(30):
+        ops.append({"op": "create_order", "client_id": f"c{i}", "table_id": tables[i % 3]["id"],
+                    "items": [{"name": "Dish", "price": float(i + 1), "quantity": 1}]})
+        ops.append({"op": "pay", "client_id": f"p{i}", "order": f"c{i}", "amount": float(i % 4 + 1), "method": "card"})
+    results = repo.apply_sync(ops)["results"]
+    # ids follow the order of the operations, even for identical rows
+    order_ids = [results[2 * i]["order_id"] for i in range(30)]
+    assert order_ids == sorted(order_ids)
+    payment_ids = [results[2 * i + 1]["payment_id"] for i in range(30)]
+    assert payment_ids == sorted(payment_ids)
+    for i in range(30):
+        order = repo.get_order(results[2 * i]["order_id"])
+        assert order["table_id"] == tables[i % 3]["id"] and order["total"] == i + 1
+        assert results[2 * i + 1]["order_id"] == order["id"]
+        assert [p["id"] for p in order["payments"]] == [results[2 * i + 1]["payment_id"]]
+        assert order["payments"][0]["amount"] == i % 4 + 1
+        assert order["status"] == ("paid" if i % 4 + 1 >= i + 1 else "partial")
@@ -0,0 +1,32 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Streaming list responses (?stream=1) for orders and payments.
+"""
+
+import json
+
+
+def test_streamed_lists_match_buffered(admin_client, app):
+    app.config["STREAM_BATCH_SIZE"] = 4
+    for i in range(10):
+        o = admin_client.post("/api/orders", json={"items": [{"name": "Tea", "price": 2, "quantity": i + 1}]}).get_json()
+        admin_client.post(f"/api/orders/{o['id']}/pay", json={"method": "cash"})
+
+    for path in ("/api/orders", "/api/payments", "/api/orders?status=paid"):
+        sep = "&" if "?" in path else "?"
+        streamed = admin_client.get(f"{path}{sep}stream=1")
+        assert streamed.status_code == 200
+        assert streamed.is_streamed
+        assert streamed.mimetype == "application/json"
+        assert json.loads(streamed.get_data(as_text=True)) == admin_client.get(path).get_json()
+
+
+def test_streamed_empty_list_is_valid_json(client):
+    r = client.get("/api/payments?stream=1")
+    assert r.get_data(as_text=True) == "[]"
+    assert client.get("/api/orders?stream=1&date=bad").status_code == 400
@@ -0,0 +1,79 @@
+"""
+Project: Smart Restaurant Management System (SRMS)
+School: UMGC – Software Development and Security
+Authors: Beby Alexis, Kevin Wong , David White Jr
+Date: October 2025
+
+Description:
+Offline POS batch sync tests for POST /api/sync.
+"""
+
+import app as app_module
+
+
+def test_sync_batch_applies_once_with_one_event_per_order(admin_client, monkeypatch):
+    events = []
+    monkeypatch.setattr(app_module.socketio, "emit", lambda name, payload, **kw: events.append(payload))
+    t = admin_client.post("/api/tables", json={"label": "P1"}).get_json()
+    events.clear()
+
+    batch = {"operations": [
+        {"op": "create_order", "client_id": "local-1", "table_id": t["id"], "items": [{"name": "Beer", "price": 6, "quantity": 2}]},
+        {"op": "add_items", "order": "local-1", "items": [{"name": "Nachos", "price": 9}]},
+        {"op": "pay", "client_id": "pay-1", "order": "local-1", "amount": 21, "method": "card"},
+        {"op": "create_order", "client_id": "local-2", "items": [{"name": "Water", "price": "free"}]},
+        {"op": "teleport"},
+    ]}
+    r = admin_client.post("/api/sync", json=batch, headers={"Idempotency-Key": "batch-1"})
+    assert r.status_code == 200
+    results = r.get_json()["results"]
+    assert [x["status"] for x in results] == ["ok", "ok", "ok", "error", "error"]
+    assert [x.get("error") for x in results[3:]] == ["invalid", "unknown_op"]
+
+    order = admin_client.get(f"/api/orders?table_id={t['id']}").get_json()[0]
+    assert order["id"] == results[0]["order_id"]
+    assert order["status"] == "paid" and order["balance"] == 0
+    assert [e["type"] for e in events] == ["order.created"]
+
+    # the terminal replays the batch after a dropped response
+    again = admin_client.post("/api/sync", json=batch, headers={"Idempotency-Key": "batch-1"})
+    assert again.get_json() == r.get_json()
+    assert len(admin_client.get("/api/orders").get_json()) == 1
+    assert len(events) == 1
+
+
+def test_sync_validates_batch(client, app, login):
+    assert client.post("/api/sync", json={"operations": []}).status_code == 401
+    login(client)
+    assert client.post("/api/sync", json={}).status_code == 400
+    app.config["SYNC_MAX_OPERATIONS"] = 1
+    assert client.post("/api/sync", json={"operations": [{}, {}]}).status_code == 413
+
+
+def test_sync_rejects_malformed_references(admin_client):
+    r = admin_client.post("/api/sync", json={"operations": [
+        {"op": "create_order", "client_id": "ok", "items": [{"name": "Tea", "price": 2}]},
+        {"op": "pay", "order": {"x": 1}},
+        {"op": "add_items", "order": [1], "items": [{"name": "Cake", "price": 4}]},
+        {"op": "add_items", "order": "ok", "items": [{"menu_item_id": [1]}]},
+        {"op": "create_order", "client_id": ["a"], "items": []},
+        {"op": "pay", "order": True},
+    ]})
+    assert r.status_code == 200
+    results = r.get_json()["results"]
+    assert [x["status"] for x in results] == ["ok"] + ["error"] * 5
+    assert {x["error"] for x in results[1:]} == {"invalid"}
+    assert len(admin_client.get("/api/orders").get_json()) == 1
+
+
+def test_sync_integer_client_ids_refer_to_the_batch_first(admin_client):
+    existing = admin_client.post("/api/orders", json={"items": [{"name": "Steak", "price": 50}]}).get_json()
+    r = admin_client.post("/api/sync", json={"operations": [
+        {"op": "create_order", "client_id": existing["id"], "items": [{"name": "Tea", "price": 5}]},
+        {"op": "pay", "order": existing["id"], "amount": 5},
+    ]})
+    results = r.get_json()["results"]
+    assert [x["status"] for x in results] == ["ok", "ok"]
+    assert results[1]["order_id"] == results[0]["order_id"] != existing["id"]
+    statuses = {o["id"]: o["status"] for o in admin_client.get("/api/orders").get_json()}
+    assert statuses == {existing["id"]: "open", results[0]["order_id"]: "paid"}